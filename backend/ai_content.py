@@ -1,8 +1,7 @@
-import os
-from google import genai
 from PIL import Image
 from dotenv import load_dotenv
 from llm_parser import parse_json_object
+from llm_clients import get_gemini_client
 
 load_dotenv()
 
@@ -22,8 +21,8 @@ def analyze_other_content(image_path: str, item_name: str) -> dict:
         # Load the image
         image = Image.open(image_path)
         
-        # Create Gemini client
-        client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+        # Shared Gemini client
+        client = get_gemini_client()
         
         prompt = f"""
 You are analyzing an image that contains: {item_name}
@@ -5,20 +5,31 @@ from torchvision import transforms
 from PIL import Image
 import numpy as np
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from .model import DeepfakeModel
 
 
 class DeepfakeInference:
     """Simple inference class for deepfake detection"""
     
-    def __init__(self, model_path="ai_detection/deepfake_model.pth"):
+    def __init__(self, model_path="ai_detection/deepfake_model.pth", precision="fp32"):
         """
         Initialize the inference model
         
         Args:
             model_path (str): Path to the trained model file
+            precision (str): "fp32" (default), "fp16", "int8" or "auto".
+                Reduced precision is opt-in: the verdict thresholds sit close to the
+                softmax boundary, so check parity with fp32 before enabling it.
+                "fp16" requires CUDA; "int8" applies dynamic quantization and runs
+                on CPU; "auto" uses fp16 on GPU and fp32 on CPU.
         """
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.precision = self._resolve_precision(precision)
+        self.dtype = torch.float16 if self.precision == "fp16" else torch.float32
         self.model = None
         self.transform = None
         self.label_mapping = {}
@@ -50,13 +61,34 @@ class DeepfakeInference:
         
         # Load state dict
         temp_model.model.load_state_dict(checkpoint['model_state_dict'])
-        self.model = temp_model.model.to(self.device)
-        self.model.eval()
+        model = temp_model.model.eval()
         
-        print(f"Model loaded successfully on {self.device}")
+        # Reduce precision for faster inference
+        if self.precision == "fp16":
+            model = model.half()
+        elif self.precision == "int8":
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        
+        self.model = model.to(self.device)
+        
+        print(f"Model loaded successfully on {self.device} ({self.precision})")
         print(f"Label mapping: {self.label_mapping}")
         print(f"Index mapping: {self.index_mapping}")
     
+    def _resolve_precision(self, precision):
+        """Pick the inference precision supported by the current device"""
+        if precision == "auto":
+            return "fp16" if self.device == "cuda" else "fp32"
+        if precision == "fp16" and self.device != "cuda":
+            print("fp16 inference requires CUDA, falling back to fp32")
+            return "fp32"
+        if precision == "int8":
+            # Dynamically quantized modules only run on CPU
+            self.device = "cpu"
+        if precision not in ("fp32", "fp16", "int8"):
+            raise ValueError(f"Unsupported precision: {precision}")
+        return precision
+    
     def _setup_transforms(self):
         """Setup image preprocessing transforms"""
         self.transform = transforms.Compose([
@@ -76,7 +108,7 @@ class DeepfakeInference:
             # Apply transforms
             img = self.transform(img)
             img = img.unsqueeze(0)  # Add batch dimension
-            img = img.to(self.device)
+            img = img.to(self.device, dtype=self.dtype)
             
             return img
         except Exception as e:
@@ -107,25 +139,40 @@ class DeepfakeInference:
         # Run inference
         with torch.no_grad():
             outputs = self.model(img)
-            probabilities = F.softmax(outputs, dim=1)
-            
-            # Get prediction
-            predicted_class = outputs.argmax(dim=1).item()
-            confidence = probabilities[0][predicted_class].item()
-            
-            # Get the probability for the "Fake" class (class 1)
-            fake_probability = probabilities[0][1].item() if len(probabilities[0]) > 1 else 0.0
-            
-            # Determine if it's a deepfake based on BOTH class prediction AND confidence threshold
-            # Only flag as deepfake if predicted as fake (class 1) AND confidence exceeds threshold
-            is_deepfake = (predicted_class == 1) and (fake_probability >= confidence_threshold)
-            prediction_label = self.index_mapping.get(predicted_class, "Unknown")
+        
+        return self._format_prediction(outputs[0], confidence_threshold)
+    
+    def _format_prediction(self, output, confidence_threshold=0.6):
+        """
+        Convert the model output for a single image into a result dict
+        
+        Args:
+            output (torch.Tensor): Model output for one image, shape [num_classes]
+            confidence_threshold (float): Threshold for classification
             
-            # Get all probabilities
-            prob_dict = {}
-            for idx, prob in enumerate(probabilities[0]):
-                label = self.index_mapping.get(idx, f"Class_{idx}")
-                prob_dict[label] = prob.item()
+        Returns:
+            dict: Same structure as is_deepfake
+        """
+        output = output.float()
+        probabilities = F.softmax(output, dim=0)
+        
+        # Get prediction
+        predicted_class = output.argmax().item()
+        confidence = probabilities[predicted_class].item()
+        
+        # Get the probability for the "Fake" class (class 1)
+        fake_probability = probabilities[1].item() if len(probabilities) > 1 else 0.0
+        
+        # Determine if it's a deepfake based on BOTH class prediction AND confidence threshold
+        # Only flag as deepfake if predicted as fake (class 1) AND confidence exceeds threshold
+        is_deepfake = (predicted_class == 1) and (fake_probability >= confidence_threshold)
+        prediction_label = self.index_mapping.get(predicted_class, "Unknown")
+        
+        # Get all probabilities
+        prob_dict = {}
+        for idx, prob in enumerate(probabilities):
+            label = self.index_mapping.get(idx, f"Class_{idx}")
+            prob_dict[label] = prob.item()
         
         return {
             'is_deepfake': is_deepfake,
@@ -164,7 +211,105 @@ class DeepfakeInference:
         
         return results
 
+class DeepfakeBatcher:
+    """
+    Coalesces concurrent single-image requests into batched forward passes.
+    
+    Images submitted within max_wait_ms of each other (up to max_batch) are
+    stacked into one tensor and run through the model in a single call,
+    amortizing per-call overhead across concurrent requests.
+    """
+    
+    def __init__(self, inference, max_batch=16, max_wait_ms=10):
+        """
+        Args:
+            inference (DeepfakeInference): Loaded inference instance
+            max_batch (int): Maximum number of images per forward pass
+            max_wait_ms (float): How long to wait for more images before running a batch
+        """
+        self.inference = inference
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def submit(self, image_path, confidence_threshold=0.6):
+        """
+        Queue an image for batched inference
+        
+        Args:
+            image_path (str): Path to the image file
+            confidence_threshold (float): Threshold for classification
+            
+        Returns:
+            Future: Resolves to the same dict returned by is_deepfake
+        """
+        future = Future()
+        try:
+            # Preprocess on the caller's thread so the worker only runs the model
+            img = self.inference._preprocess_image(image_path)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+        
+        self._queue.put((img, confidence_threshold, future))
+        return future
+    
+    def _run(self):
+        """Worker loop: gather up to max_batch images and run them together"""
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            
+            while len(items) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                batch = torch.cat([img for img, _, _ in items])
+                with torch.inference_mode():
+                    outputs = self.inference.model(batch)
+                
+                for output, (_, confidence_threshold, future) in zip(outputs, items):
+                    future.set_result(self.inference._format_prediction(output, confidence_threshold))
+            except Exception as e:
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+
+
 INFERENCE = None
+BATCHER = None
+_INIT_LOCK = threading.Lock()
+
+# Precision of the shared model ("fp32" unless opted in, see DeepfakeInference)
+DEEPFAKE_PRECISION = os.environ.get("DEEPFAKE_PRECISION", "fp32")
+
+
+def get_batcher(model_path="ai_detection/deepfake_model.pth"):
+    """
+    Get the shared DeepfakeBatcher, loading the model on first use
+    
+    Args:
+        model_path (str): Path to the trained model file
+        
+    Returns:
+        DeepfakeBatcher: Shared batcher instance
+    """
+    global INFERENCE, BATCHER
+    with _INIT_LOCK:
+        if BATCHER is None:
+            if INFERENCE is None:
+                INFERENCE = DeepfakeInference(model_path, precision=DEEPFAKE_PRECISION)
+            BATCHER = DeepfakeBatcher(INFERENCE)
+    return BATCHER
+
 # Convenience function for simple usage
 def is_deepfake(image_path, model_path="ai_detection/deepfake_model.pth", confidence_threshold=0.6):
     """
@@ -182,7 +327,7 @@ def is_deepfake(image_path, model_path="ai_detection/deepfake_model.pth", confid
     # Run prediction
     global INFERENCE
     if INFERENCE is None:
-        INFERENCE = DeepfakeInference(model_path)
+        INFERENCE = DeepfakeInference(model_path, precision=DEEPFAKE_PRECISION)
     return INFERENCE.is_deepfake(image_path, confidence_threshold)
 
 
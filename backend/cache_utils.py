@@ -0,0 +1,120 @@
+import hashlib
+import io
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional, Union
+from PIL import Image
+import numpy as np
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache with per-entry expiry.
+
+    Used to short-circuit expensive, deterministic calls (model inference,
+    LLM lookups) that are repeated across requests.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600):
+        """
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid (None = never expires)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Drop key from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_NON_ALNUM_RE = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_key(text: str) -> str:
+    """
+    Normalize free text (item names, brands) for use as a cache key.
+
+    Lowercases, drops punctuation and collapses whitespace, so
+    "Gucci GG Marmont" and "gucci gg-marmont " map to the same entry.
+    """
+    return _NON_ALNUM_RE.sub(' ', text.lower()).strip()
+
+
+def perceptual_hash(image_source: Union[bytes, str, Path, Image.Image]) -> str:
+    """
+    Compute a 64-bit difference hash (dHash) of an encoded image.
+
+    Re-saved or slightly re-compressed copies of the same frame produce the
+    same hash, so it can key caches for image-level results.
+
+    Args:
+        image_source: Encoded image data (JPEG, PNG, ...), a path to an image file,
+            or an already opened PIL image
+
+    Returns:
+        str: 16-character hex digest
+    """
+    if isinstance(image_source, bytes):
+        image_source = io.BytesIO(image_source)
+    if not isinstance(image_source, Image.Image):
+        image_source = Image.open(image_source)
+    image = image_source.convert('L').resize((9, 8))
+    pixels = np.asarray(image, dtype=np.int16)
+    diff = pixels[:, 1:] > pixels[:, :-1]
+    return np.packbits(diff.flatten()).tobytes().hex()
+
+
+def file_digest(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file's contents, read in chunks.
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        str: 64-character hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
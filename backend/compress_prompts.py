@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Offline prompt compression with LLMLingua.
+
+Compresses the prose of the static prompt templates and writes candidates to
+prompts/compressed/ for review and A/B testing. Fenced ```json blocks and
+format placeholders are kept verbatim so the response schema survives.
+Nothing here is imported by the backend - a compressed prompt only replaces
+its template after it has been validated against the original.
+
+Usage:
+    pip install llmlingua
+    python compress_prompts.py [--rate 0.5]
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+from prompts.counterfeit import SINGLE_CRITERION_SYSTEM_PROMPT
+from prompts.criteria import CRITERIA_PROMPT
+from prompts.fact_check import FACT_CHECK_PROMPT
+from prompts.item_detection import IMAGE_ANALYSIS_PROMPT, IMAGE_ANALYSIS_PROMPT_WITH_REPOSITIONING
+from prompts.person import PERSON_FAKENESS_PROMPT
+
+OUTPUT_DIR = Path("prompts/compressed")
+
+TEMPLATES = {
+    "counterfeit_system": SINGLE_CRITERION_SYSTEM_PROMPT,
+    "criteria": CRITERIA_PROMPT,
+    "fact_check": FACT_CHECK_PROMPT,
+    "image_analysis": IMAGE_ANALYSIS_PROMPT,
+    "image_analysis_with_repositioning": IMAGE_ANALYSIS_PROMPT_WITH_REPOSITIONING,
+    "person": PERSON_FAKENESS_PROMPT,
+}
+
+# Segments that must reach the model unchanged: JSON examples and placeholders
+PROTECTED_RE = re.compile(r"```json.*?```|\{[a-z_]+\}|__[A-Z_]+__", re.DOTALL)
+
+
+def compress_template(compressor, template: str, rate: float) -> str:
+    """Compress the prose between protected segments, keeping the segments as-is."""
+    parts = []
+    last_end = 0
+    for match in PROTECTED_RE.finditer(template):
+        parts.append(_compress_prose(compressor, template[last_end:match.start()], rate))
+        parts.append(match.group(0))
+        last_end = match.end()
+    parts.append(_compress_prose(compressor, template[last_end:], rate))
+    return "".join(parts)
+
+
+def _compress_prose(compressor, text: str, rate: float) -> str:
+    if len(text.split()) < 20:
+        return text
+    result = compressor.compress_prompt(text, rate=rate, force_tokens=["\n", "#", "-", ":"])
+    return f"\n{result['compressed_prompt'].strip()}\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress prompt templates with LLMLingua")
+    parser.add_argument("--rate", type=float, default=0.5, help="Target fraction of tokens to keep")
+    args = parser.parse_args()
+
+    from llmlingua import PromptCompressor
+
+    compressor = PromptCompressor(
+        model_name="microsoft/llmlingua-2-xlm-roberta-large-meetingbank",
+        use_llmlingua2=True,
+    )
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    for name, template in TEMPLATES.items():
+        compressed = compress_template(compressor, template, args.rate)
+        (OUTPUT_DIR / f"{name}.txt").write_text(compressed)
+        print(f"✅ {name}: {len(template)} -> {len(compressed)} chars")
+
+
+if __name__ == "__main__":
+    main()
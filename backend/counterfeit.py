@@ -1,16 +1,20 @@
-import os
 from typing import List, Dict, Any
 from pathlib import Path
-from google import genai
 from PIL import Image
 from dotenv import load_dotenv
-from prompts.counterfeit import get_single_criterion_prompt
+from prompts.counterfeit import SINGLE_CRITERION_SCHEMA, SINGLE_CRITERION_SYSTEM_PROMPT, get_single_criterion_prompt
 from llm_parser import parse_json_object
+from llm_clients import get_gemini_client
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 load_dotenv()
 
+# Shared pool for the per-criterion Gemini calls, reused across requests instead of
+# spinning up new threads for every /analyze. Concurrent /analyze requests queue their
+# checks here, so 16 caps the Gemini calls per process (see the pool overview in main.py).
+CRITERION_CHECK_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="criterion-check")
+
 def load_images(image_paths: List[str]) -> List[Image.Image]:
     """Load all images from paths."""
     images = []
@@ -24,7 +28,7 @@ def load_images(image_paths: List[str]) -> List[Image.Image]:
 
 def analyze_single_criterion(item: str, criterion: str, criterion_number: int, total_criteria: int, image: Image.Image) -> str:
     """Send a single image and criterion to Gemini for authentication analysis."""
-    client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+    client = get_gemini_client()
     
     prompt = get_single_criterion_prompt(item, criterion, criterion_number, total_criteria)
     
@@ -35,7 +39,11 @@ def analyze_single_criterion(item: str, criterion: str, criterion_number: int, t
         model="gemini-flash-latest",
         contents=contents,
         config={
-            "temperature": 0.1
+            "temperature": 0.1,
+            "system_instruction": SINGLE_CRITERION_SYSTEM_PROMPT,
+            # Structured output: the response is always parseable, so retries are for API errors
+            "response_mime_type": "application/json",
+            "response_schema": SINGLE_CRITERION_SCHEMA
         }
     )
     
@@ -203,34 +211,33 @@ def counterfeit(item: str, criteria_data: Dict[str, List[str]], images: List[str
         current_image = criteria_images[image_idx]
         tasks.append((item, criterion, i+1, len(criteria), current_image))
     
-    # Run analyses in parallel using ThreadPoolExecutor
+    # Run analyses in parallel on the shared pool
     criteria_results = []
-    with ThreadPoolExecutor(max_workers=len(criteria)) as executor:
-        # Submit all tasks
-        future_to_criterion = {
-            executor.submit(analyze_single_criterion_with_retry, *task): task[2]  # task[2] is criterion_number
-            for task in tasks
-        }
-        
-        # Collect results as they complete
-        results_dict = {}
-        for future in as_completed(future_to_criterion):
-            criterion_number = future_to_criterion[future]
-            try:
-                result = future.result()
-                results_dict[criterion_number] = result
-            except Exception as e:
-                print(f"    ❌ Thread error for criterion {criterion_number}: {str(e)}")
-                results_dict[criterion_number] = sanitize_for_json({
-                    "criterion": str(tasks[criterion_number - 1][1]),
-                    "score": 1,
-                    "passed": False,
-                    "notes": f"Thread execution error: {str(e)}",
-                    "confidence_percentage": 20.0,
-                    "confidence": 0.2,
-                    "visual_markers": [],
-                    "comparison_notes": "Analysis failed"
-                })
+    # Submit all tasks
+    future_to_criterion = {
+        CRITERION_CHECK_EXECUTOR.submit(analyze_single_criterion_with_retry, *task): task[2]  # task[2] is criterion_number
+        for task in tasks
+    }
+    
+    # Collect results as they complete
+    results_dict = {}
+    for future in as_completed(future_to_criterion):
+        criterion_number = future_to_criterion[future]
+        try:
+            result = future.result()
+            results_dict[criterion_number] = result
+        except Exception as e:
+            print(f"    ❌ Thread error for criterion {criterion_number}: {str(e)}")
+            results_dict[criterion_number] = sanitize_for_json({
+                "criterion": str(tasks[criterion_number - 1][1]),
+                "score": 1,
+                "passed": False,
+                "notes": f"Thread execution error: {str(e)}",
+                "confidence_percentage": 20.0,
+                "confidence": 0.2,
+                "visual_markers": [],
+                "comparison_notes": "Analysis failed"
+            })
     
     # Sort results by criterion number to maintain order
     criteria_results = [results_dict[i+1] for i in range(len(criteria))]
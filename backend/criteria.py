@@ -1,19 +1,20 @@
-import os
 import sqlite3
 import json
 import numpy as np
-from google import genai
 from dotenv import load_dotenv
-from prompts.criteria import get_criteria_prompt
+from prompts.criteria import count_criteria_tokens, get_criteria_prompt
 from llm_parser import parse_json_object
+from llm_clients import get_gemini_client
 from sentence_transformers import SentenceTransformer
 import time
+from typing import Iterator, List, Optional, Tuple
 
 load_dotenv()
 
 # Simple cache database
 CACHE_DB = "criteria_cache.db"
 SIMILARITY_THRESHOLD = 0.9
+CRITERIA_MODEL = "gemini-2.5-pro"
 
 # Initialize embedding model
 model = SentenceTransformer('all-MiniLM-L6-v2')
@@ -49,12 +50,23 @@ def cache_criteria(item: str, criteria_data: dict):
     conn.close()
 
 def get_cached_criteria(item: str):
-    """Get cached criteria using embedding similarity."""
+    """Get cached criteria, by exact (case-insensitive) name first, then embedding similarity."""
+    conn = sqlite3.connect(CACHE_DB)
+    cursor = conn.cursor()
+    
+    # Repeat lookups for the same item skip the embedding and the full table scan
+    cursor.execute(
+        'SELECT criteria_data FROM criteria_cache WHERE lower(trim(item)) = lower(trim(?)) LIMIT 1',
+        (item,)
+    )
+    row = cursor.fetchone()
+    if row:
+        conn.close()
+        return json.loads(row[0])
+    
     # Generate embedding for the query item
     query_embedding = model.encode(item)
     
-    conn = sqlite3.connect(CACHE_DB)
-    cursor = conn.cursor()
     cursor.execute('SELECT item, criteria_data, embedding FROM criteria_cache')
     rows = cursor.fetchall()
     conn.close()
@@ -80,51 +92,70 @@ def get_cached_criteria(item: str):
     
     return None
 
-def search_online_criteria(item: str, max_retries: int = 3):
-    """Use Gemini Flash Lite with Google Search to find authentic criteria online."""
+def criteria_generation_config():
+    """Generation config for criteria requests: Google Search grounding plus a thinking budget."""
     from google.genai import types
     
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found in environment variables")
-    
-    client = genai.Client(api_key=api_key)
-    
-    prompt = get_criteria_prompt(item)
-    
-    # Configure with Google Search tool
-    tools = [
-        types.Tool(googleSearch=types.GoogleSearch())
-    ]
-    
-    # Configure generation with tools
-    generate_content_config = types.GenerateContentConfig(
-        tools=tools,
+    return types.GenerateContentConfig(
+        tools=[types.Tool(googleSearch=types.GoogleSearch())],
         thinking_config=types.ThinkingConfig(
             thinking_budget=2048,
         )
     )
+
+def criteria_contents(item: str):
+    """Request contents for the criteria prompt of one item."""
+    from google.genai import types
     
-    # Create content
-    contents = [
+    return [
         types.Content(
             role="user",
             parts=[
-                types.Part.from_text(text=prompt),
+                types.Part.from_text(text=get_criteria_prompt(item)),
             ],
         ),
     ]
+
+def build_criteria_request(item: str, custom_id: Optional[str] = None, batch: bool = False) -> dict:
+    """
+    Build the criteria request for one item, for either the interactive or the batch API.
+    
+    Args:
+        item: The name/type of item to check
+        custom_id: Stable id for matching a batch response back to its request
+        batch: Return an inlined Batch API request instead of generate_content kwargs
+        
+    Returns:
+        dict: generate_content keyword arguments, or an inlined batch request whose
+            metadata carries custom_id and the item
+    """
+    if batch:
+        # The batch job itself names the model
+        return {
+            "contents": criteria_contents(item),
+            "config": criteria_generation_config(),
+            "metadata": {"custom_id": custom_id or item, "item": item},
+        }
+    return {
+        "model": CRITERIA_MODEL,
+        "contents": criteria_contents(item),
+        "config": criteria_generation_config(),
+    }
+
+def search_online_criteria(item: str, max_retries: int = 3):
+    """Use Gemini Flash Lite with Google Search to find authentic criteria online."""
+    client = get_gemini_client()
+    
+    # Model, contents and config - the same request the batch path submits
+    request = build_criteria_request(item)
+    print(f"📏 Criteria prompt for {item}: ~{count_criteria_tokens(item)} tokens")
     
     # Retry logic for JSON parsing errors
     last_error = None
     for attempt in range(max_retries):
         try:
             # Call model with search capabilities
-            response = client.models.generate_content(
-                model="gemini-2.5-pro",
-                contents=contents,
-                config=generate_content_config
-            )
+            response = client.models.generate_content(**request)
             
             content = response.text
             
@@ -174,6 +205,13 @@ def criteria(item: str):
     print(f"Searching online for {item}")
     detailed_data = search_online_criteria(item)
     
+    return simplify_criteria(item, detailed_data)
+
+def simplify_criteria(item: str, detailed_data: dict) -> dict:
+    """
+    Add the backward-compatible simple criteria/location lists to a detailed
+    criteria response, caching the full result.
+    """
     # Transform detailed format to include backward-compatible simple lists
     if "criteria" in detailed_data and isinstance(detailed_data["criteria"], list):
         if len(detailed_data["criteria"]) > 0 and isinstance(detailed_data["criteria"][0], dict):
@@ -201,6 +239,69 @@ def criteria(item: str):
     # Fallback: old format or unexpected format
     return detailed_data
 
+def build_criteria_batch(items: List[str]) -> List[dict]:
+    """
+    Build inlined Gemini Batch API requests for the criteria of many items.
+    
+    Batch mode is billed at half the interactive price and isn't bound by the
+    interactive rate limits, so it suits non-interactive flows like catalog ingest.
+    
+    Args:
+        items: Item names to generate criteria for
+        
+    Returns:
+        List of inlined requests; metadata carries a stable custom_id and the item
+    """
+    return [
+        build_criteria_request(item, custom_id=f"crit-{i}", batch=True)
+        for i, item in enumerate(items)
+    ]
+
+def submit_criteria_batch(items: List[str]) -> Optional[str]:
+    """
+    Submit a criteria batch job for items not already in the cache.
+    
+    Returns:
+        Optional[str]: Batch job name to pass to parse_criteria_batch_results, or
+            None if every item was already cached and no job was submitted
+    """
+    init_cache()
+    pending = [item for item in items if get_cached_criteria(item) is None]
+    if not pending:
+        print("✅ All items already have cached criteria, no batch submitted")
+        return None
+    
+    job = get_gemini_client().batches.create(
+        model=CRITERIA_MODEL,
+        src=build_criteria_batch(pending),
+        config={"display_name": f"criteria-{int(time.time())}"}
+    )
+    print(f"📦 Submitted criteria batch {job.name} for {len(pending)} items")
+    return job.name
+
+def parse_criteria_batch_results(job_name: str) -> Iterator[Tuple[str, dict]]:
+    """
+    Yield (item, criteria) for each successful response of a finished batch job.
+    
+    Results are cached like interactive lookups, so later criteria() calls for
+    these items are cache hits. Failed or unparsable responses are skipped.
+    """
+    job = get_gemini_client().batches.get(name=job_name)
+    if job.state.name != "JOB_STATE_SUCCEEDED":
+        raise ValueError(f"Batch job {job_name} is not finished (state: {job.state.name})")
+    
+    init_cache()
+    for inline_response in job.dest.inlined_responses:
+        item = (inline_response.metadata or {}).get("item")
+        if inline_response.error or not item:
+            print(f"❌ Batch request failed for {item}: {inline_response.error}")
+            continue
+        try:
+            detailed_data = parse_json_object(inline_response.response.text)
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"❌ Invalid JSON in batch response for {item}: {str(e)}")
+            continue
+        yield item, simplify_criteria(item, detailed_data)
 
 if __name__ == "__main__":
     item_name = "LV Baby Blue Card Holder"
@@ -1,9 +1,9 @@
 import os
-from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 from prompts.fact_check import get_fact_check_prompt
 from llm_parser import parse_json_object
+from llm_clients import get_gemini_client
 from pathlib import Path
 from PIL import Image
 
@@ -41,13 +41,8 @@ def fact_check(image_path: str):
     if not os.path.exists(image_path):
         raise FileNotFoundError(f"Image file not found: {image_path}")
     
-    # Get API key
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found in environment variables")
-    
-    # Initialize Gemini client
-    client = genai.Client(api_key=api_key)
+    # Shared Gemini client
+    client = get_gemini_client()
     
     # Get the fact-check prompt
     prompt = get_fact_check_prompt()
@@ -141,3 +141,7 @@ FREQUENCY_BOOST_MED = 0.08   # 2 appearances
 FREQUENCY_THRESHOLD_HIGH = 3
 FREQUENCY_THRESHOLD_MED = 2
 
+
+# On-disk cache of raw Google Lens responses (keyed by image URL)
+LENS_CACHE_DB = "lens_cache.db"
+LENS_CACHE_TTL = 7 * 86400  # seconds
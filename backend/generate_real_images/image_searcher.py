@@ -5,11 +5,16 @@ Main module for reverse image search using Google Lens API with counterfeit dete
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import os
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
 from dotenv import load_dotenv
 
 from .brand_detector import BrandDetector
+from .lens_cache import LensCache
 from .trust_scorer import TrustScorer
 from .utils import calculate_similarity_score
 
@@ -24,17 +29,107 @@ class ReverseImageSearcher:
     applies trust scoring, and provides authentication verdicts.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the reverse image searcher."""
-        self.api_key = api_key or os.getenv('SERPAPI_API_KEY')
-        if not self.api_key:
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True):
+        """
+        Initialize the reverse image searcher.
+        
+        Args:
+            api_key: SerpApi key (defaults to SERPAPI_API_KEY). Several comma-separated
+                keys form a pool that is rotated when one runs out of quota.
+            use_cache: Reuse Google Lens responses cached on disk for the same image URL
+        """
+        keys = api_key or os.getenv('SERPAPI_API_KEY') or ''
+        self.api_keys = [key.strip() for key in keys.split(',') if key.strip()]
+        if not self.api_keys:
             raise ValueError(
                 "SerpApi API key is required. Set SERPAPI_API_KEY environment "
                 "variable or pass api_key parameter."
             )
+        self.api_key = self.api_keys[0]
+        self._api_key_lock = threading.Lock()
         
         self.brand_detector = BrandDetector()
         self.trust_scorer = TrustScorer()
+        
+        # Reuse keep-alive connections to SerpApi across searches (and request threads)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        
+        self.cache = LensCache() if use_cache else None
+    
+    def _fetch_lens_data(self, image_url: str) -> Optional[Dict]:
+        """Raw Google Lens response for image_url (cached on disk), or None on a SerpApi error."""
+        data = self.cache.get(image_url) if self.cache else None
+        if data is not None:
+            print(f"💾 Using cached Google Lens response: {image_url}")
+        else:
+            print(f"🔍 Searching with Google Lens API: {image_url}")
+            
+            # Make Google Lens API request, moving to the next key if this one is out of quota
+            for _ in range(len(self.api_keys)):
+                api_key = self.api_key
+                params = {
+                    'engine': 'google_lens',
+                    'url': image_url,
+                    'api_key': api_key,
+                    'hl': 'en',
+                }
+                response = self.session.get("https://serpapi.com/search", params=params, timeout=30)
+                if response.status_code not in (402, 429):
+                    break
+                self._rotate_api_key(api_key)
+            response.raise_for_status()
+            data = response.json()
+            
+            if 'error' in data:
+                print(f"❌ SerpApi Error: {data['error']}")
+                return None
+            
+            if self.cache:
+                self.cache.set(image_url, data)
+        
+        return data
+    
+    def stream_by_image_url(self, image_url: str) -> Iterator[Dict]:
+        """
+        Lazily yield processed Google Lens results for an image, exact matches first.
+        
+        Each result is only trust-scored when the consumer pulls it, so callers that
+        need the first few matching results (e.g. with itertools.islice) can stop early.
+        Results are not frequency-boosted - use search_by_image_url for that.
+        
+        Args:
+            image_url: URL of the image to search
+            
+        Yields:
+            Search results with trust scores and brand info
+        """
+        data = self._fetch_lens_data(image_url)
+        if not data:
+            return
+        
+        print(f"📊 Available sections: {list(data.keys())}")
+        
+        # Identify brand from results
+        detected_brand = self.brand_detector.identify_from_lens_results(data)
+        if detected_brand:
+            print(f"🏷️  Detected brand: {detected_brand['name']}")
+            print(f"🌐 Official website: {detected_brand['official_website']}")
+            self._add_brand_to_trust_scores(detected_brand)
+        
+        for key, section, is_exact, icon in (
+            ('exact_matches', 'Exact Matches', True, '✅'),
+            ('visual_matches', 'Visual Matches', False, '🎯'),
+        ):
+            matches = data.get(key) or []
+            if matches:
+                print(f"{icon} Found {len(matches)} {section.lower()}")
+            for match in matches:
+                result = self._process_result(match, image_url, section, is_exact)
+                if detected_brand:
+                    result['detected_brand'] = detected_brand['name']
+                    result['official_website'] = detected_brand['official_website']
+                yield result
     
     def search_by_image_url(self, image_url: str, max_results: int = 10) -> List[Dict]:
         """
@@ -49,48 +144,8 @@ class ReverseImageSearcher:
             List of search results with trust scores and brand info
         """
         try:
-            # Make Google Lens API request
-            params = {
-                'engine': 'google_lens',
-                'url': image_url,
-                'api_key': self.api_key,
-                'hl': 'en',
-            }
-            
-            print(f"🔍 Searching with Google Lens API: {image_url}")
-            
-            response = requests.get("https://serpapi.com/search", params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'error' in data:
-                print(f"❌ SerpApi Error: {data['error']}")
-                return []
-            
-            print(f"📊 Available sections: {list(data.keys())}")
-            
-            # Identify brand from results
-            detected_brand = self.brand_detector.identify_from_lens_results(data)
-            if detected_brand:
-                print(f"🏷️  Detected brand: {detected_brand['name']}")
-                print(f"🌐 Official website: {detected_brand['official_website']}")
-                self._add_brand_to_trust_scores(detected_brand)
-            
-            # Extract results
-            image_results = []
-            
-            # Process exact matches
-            if 'exact_matches' in data and data['exact_matches']:
-                print(f"✅ Found {len(data['exact_matches'])} exact matches")
-                for i, result in enumerate(data['exact_matches'][:max_results]):
-                    image_results.append(self._process_result(result, image_url, 'Exact Matches', True))
-            
-            # Process visual matches
-            if 'visual_matches' in data and data['visual_matches']:
-                print(f"🎯 Found {len(data['visual_matches'])} visual matches")
-                remaining = max_results - len(image_results)
-                for result in data['visual_matches'][:remaining]:
-                    image_results.append(self._process_result(result, image_url, 'Visual Matches', False))
+            # Only the first max_results matches are processed
+            image_results = list(islice(self.stream_by_image_url(image_url), max_results))
             
             print(f"📦 Total results collected: {len(image_results)}")
             
@@ -98,18 +153,9 @@ class ReverseImageSearcher:
                 print("⚠️  No results found in any section")
                 return []
             
-            # Limit to requested number
-            image_results = image_results[:max_results]
-            
             # Apply frequency-based trust boost
             image_results = self.trust_scorer.apply_frequency_boost(image_results)
             
-            # Add detected brand info to results
-            if image_results and detected_brand:
-                for result in image_results:
-                    result['detected_brand'] = detected_brand['name']
-                    result['official_website'] = detected_brand['official_website']
-            
             print(f"✅ Returning {len(image_results)} results from Google Lens")
             return image_results
             
@@ -122,6 +168,33 @@ class ReverseImageSearcher:
             traceback.print_exc()
             return []
     
+    def search_many(self, image_urls: List[str], max_results: int = 10, workers: int = 8) -> Dict[str, List[Dict]]:
+        """
+        Run Google Lens searches for several images concurrently.
+        
+        Args:
+            image_urls: URLs of the images to search
+            max_results: Maximum number of results per image
+            workers: Maximum number of searches in flight
+            
+        Returns:
+            Dict mapping each image URL to its search results
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.search_by_image_url, image_url, max_results): image_url
+                for image_url in image_urls
+            }
+            return {futures[future]: future.result() for future in as_completed(futures)}
+    
+    def _rotate_api_key(self, exhausted_key: str):
+        """Switch to the next key in the pool, unless another thread already moved past exhausted_key."""
+        with self._api_key_lock:
+            if self.api_key == exhausted_key and len(self.api_keys) > 1:
+                index = self.api_keys.index(exhausted_key)
+                self.api_key = self.api_keys[(index + 1) % len(self.api_keys)]
+                print(f"🔑 SerpApi key out of quota, rotating to key #{self.api_keys.index(self.api_key) + 1}")
+    
     def search_by_local_image(self, image_path: str, max_results: int = 10) -> List[Dict]:
         """Search for similar images using a local image file."""
         try:
@@ -141,7 +214,7 @@ class ReverseImageSearcher:
             
             print(f"🔍 Searching with local image: {image_path}")
             
-            response = requests.post("https://serpapi.com/search", data=params, timeout=60)
+            response = self.session.post("https://serpapi.com/search", data=params, timeout=60)
             response.raise_for_status()
             data = response.json()
             
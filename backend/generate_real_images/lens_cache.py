@@ -0,0 +1,70 @@
+"""
+Google Lens Response Cache
+
+SQLite cache of raw SerpApi Google Lens responses, so repeat searches for the
+same image URL don't spend search quota or wait on the API.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from .config import LENS_CACHE_DB, LENS_CACHE_TTL
+
+
+class LensCache:
+    """Raw Google Lens responses keyed by SHA-256 of the image URL, with a TTL."""
+    
+    def __init__(self, db_path: str = LENS_CACHE_DB, ttl: float = LENS_CACHE_TTL):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            ttl: Seconds a response stays valid
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self._local = threading.local()
+        
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS lens_responses (
+                key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections can't be shared across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    @staticmethod
+    def _key(image_url: str) -> str:
+        return hashlib.sha256(image_url.encode()).hexdigest()
+    
+    def get(self, image_url: str) -> Optional[Dict]:
+        """Return the cached response for image_url, or None if missing/expired."""
+        row = self._connect().execute(
+            'SELECT payload FROM lens_responses WHERE key = ? AND created_at >= ?',
+            (self._key(image_url), time.time() - self.ttl)
+        ).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+    
+    def set(self, image_url: str, data: Dict) -> None:
+        """Store the response for image_url, dropping expired rows."""
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO lens_responses (key, payload, created_at) VALUES (?, ?, ?)',
+            (self._key(image_url), zlib.compress(json.dumps(data).encode()), time.time())
+        )
+        conn.execute('DELETE FROM lens_responses WHERE created_at < ?', (time.time() - self.ttl,))
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for running the Flask backend in production.
+
+Usage:
+    gunicorn -c gunicorn_conf.py main:app
+"""
+
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 5555)}"
+
+# Threaded workers: /detect and /analyze spend most of their time waiting on
+# uploads, LLM and search calls, so threads give concurrency on blocking I/O.
+# Async workers (gevent/eventlet) are not supported: their monkey-patching turns
+# the app's thread pools and the deepfake batcher into greenlets on one hub, so
+# torch/OpenCV inference and blocking sqlite3 calls would stall every connection.
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 16))
+
+# LLM calls with web search can take well over the 30s default
+timeout = 120
+
+# Keep frontend connections open between the /detect -> /criteria -> /analyze steps
+keepalive = 5
+
+# Worker heartbeat files on tmpfs so a slow disk can't stall workers
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
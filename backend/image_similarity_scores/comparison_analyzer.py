@@ -6,7 +6,8 @@ for counterfeit detection and product authentication.
 """
 
 import os
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
+import numpy as np
 from .similarity_calculator import ImageSimilarityCalculator
 from .config import SimilarityConfig, DEFAULT_CONFIG, get_similarity_interpretation, get_confidence_level
 
@@ -24,14 +25,14 @@ class ComparisonAnalyzer:
         self.config = config or DEFAULT_CONFIG
         self.similarity_calculator = ImageSimilarityCalculator(self.config)
     
-    def compare_images(self, image_path1: str, image_path2: str, 
+    def compare_images(self, image_path1: Union[str, np.ndarray], image_path2: Union[str, np.ndarray], 
                       threshold: Optional[float] = None) -> Dict:
         """
         Compare two product images and provide detailed analysis.
         
         Args:
-            image_path1: Path to first image file
-            image_path2: Path to second image file
+            image_path1: Path to first image file, or an already decoded BGR image
+            image_path2: Path to second image file, or an already decoded BGR image
             threshold: Similarity threshold for match determination
             
         Returns:
@@ -42,10 +43,10 @@ class ComparisonAnalyzer:
             if threshold is None:
                 threshold = self.config.DEFAULT_MATCH_THRESHOLD
             
-            # Check if files exist
-            if not os.path.exists(image_path1):
+            # Check if files exist (decoded images are used as-is)
+            if isinstance(image_path1, str) and not os.path.exists(image_path1):
                 return {"error": f"Image file not found: {image_path1}"}
-            if not os.path.exists(image_path2):
+            if isinstance(image_path2, str) and not os.path.exists(image_path2):
                 return {"error": f"Image file not found: {image_path2}"}
             
             # Calculate similarity
@@ -82,8 +83,32 @@ class ComparisonAnalyzer:
         except Exception as e:
             return {"error": f"Analysis failed: {str(e)}"}
     
-    def _get_image_metadata(self, image_path: str) -> Dict:
-        """Get metadata for an image file."""
+    def get_embedding(self, image_path: str) -> Optional[Dict]:
+        """
+        Get the cached feature set for an image.
+        
+        Features are keyed by image content, so callers can warm the cache for
+        an image before comparing it against several others.
+        
+        Args:
+            image_path: Path to the image file
+            
+        Returns:
+            Dictionary of features per extractor, or None if the image can't be loaded
+        """
+        return self.similarity_calculator.get_image_features(image_path)
+    
+    def _get_image_metadata(self, image_path: Union[str, np.ndarray]) -> Dict:
+        """Get metadata for an image file or decoded image."""
+        if isinstance(image_path, np.ndarray):
+            height, width = image_path.shape[:2]
+            return {
+                "path": None,
+                "dimensions": f"{width}x{height}",
+                "channels": image_path.shape[2] if image_path.ndim > 2 else 1,
+                "size_kb": None
+            }
+        
         try:
             import cv2
             
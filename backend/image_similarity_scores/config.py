@@ -40,6 +40,9 @@ class SimilarityConfig:
     # Analysis parameters
     MAX_POSSIBLE_DISTANCE_FACTOR: float = 255.0
     
+    # Number of images whose extracted features are kept in memory
+    FEATURE_CACHE_SIZE: int = 128
+    
     def __post_init__(self):
         """Validate configuration after initialization."""
         total_weight = (self.COLOR_WEIGHT + self.SIFT_WEIGHT + 
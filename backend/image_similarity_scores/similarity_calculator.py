@@ -6,9 +6,12 @@ using multiple feature extractors and weighted scoring.
 """
 
 import os
+import hashlib
+import threading
+from collections import OrderedDict
 import cv2
 import numpy as np
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Optional, Union
 from .feature_extractors import SIFTExtractor, ColorExtractor, SSIMExtractor, EdgeExtractor, ShapeExtractor
 from .config import SimilarityConfig, DEFAULT_CONFIG
 
@@ -31,28 +34,33 @@ class ImageSimilarityCalculator:
         self.ssim_extractor = SSIMExtractor(self.config)
         self.edge_extractor = EdgeExtractor(self.config)
         self.shape_extractor = ShapeExtractor(self.config)
+        
+        # Per-image feature cache keyed by SHA-256 of the file contents
+        self._feature_cache = OrderedDict()
+        self._feature_cache_lock = threading.Lock()
     
-    def calculate_similarity(self, image_path1: str, image_path2: str) -> float:
+    def calculate_similarity(self, image_path1: Union[str, np.ndarray], image_path2: Union[str, np.ndarray]) -> float:
         """
         Calculate semantic similarity between two product images.
         
         Args:
-            image_path1: Path to first image file
-            image_path2: Path to second image file
+            image_path1: Path to first image file, or an already decoded BGR image
+            image_path2: Path to second image file, or an already decoded BGR image
             
         Returns:
             Similarity score between 0.0 and 1.0 (1.0 = identical)
         """
         try:
-            # Load and preprocess images
-            img1, img2 = self._load_and_preprocess_images(image_path1, image_path2)
+            # Load cached (or freshly extracted) features for both images
+            features1 = self.get_image_features(image_path1)
+            features2 = self.get_image_features(image_path2)
             
-            if img1 is None or img2 is None:
+            if features1 is None or features2 is None:
                 print(f"❌ Error loading images: {image_path1} or {image_path2}")
                 return 0.0
             
             # Calculate different similarity metrics
-            similarities = self._calculate_all_similarities(img1, img2)
+            similarities = self._score_features(features1, features2)
             
             # Calculate weighted average
             total_score = sum(score * weight for _, score, weight in similarities)
@@ -65,6 +73,65 @@ class ImageSimilarityCalculator:
         except Exception as e:
             return 0.0
     
+    def get_image_features(self, image_path: Union[str, np.ndarray]) -> Optional[Dict]:
+        """
+        Get the extracted features for an image, using the cache when possible.
+        
+        Features only depend on the image contents, so an image compared against
+        several others (or compared again later) is only decoded and processed once.
+        
+        Args:
+            image_path: Path to the image file, or an already decoded BGR image
+                (e.g. from cv2.imdecode on downloaded bytes, with no temp file)
+            
+        Returns:
+            Dictionary of features per extractor, or None if the image can't be loaded
+        """
+        if isinstance(image_path, np.ndarray):
+            img = image_path
+            key = hashlib.sha256(f"{img.shape}{img.dtype}".encode() + np.ascontiguousarray(img).tobytes()).hexdigest()
+        else:
+            if not os.path.exists(image_path):
+                print(f"❌ Image file not found: {image_path}")
+                return None
+            
+            with open(image_path, 'rb') as f:
+                image_bytes = f.read()
+            key = hashlib.sha256(image_bytes).hexdigest()
+            img = None
+        
+        with self._feature_cache_lock:
+            features = self._feature_cache.get(key)
+            if features is not None:
+                self._feature_cache.move_to_end(key)
+                return features
+        
+        if img is None:
+            img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if img is None:
+                return None
+        
+        features = self._extract_all_features(cv2.resize(img, self.config.RESIZE_DIMENSIONS))
+        
+        with self._feature_cache_lock:
+            self._feature_cache[key] = features
+            while len(self._feature_cache) > self.config.FEATURE_CACHE_SIZE:
+                self._feature_cache.popitem(last=False)
+        
+        return features
+    
+    def _extract_all_features(self, img: np.ndarray) -> Dict:
+        """Extract features for every metric from a resized BGR image."""
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        
+        return {
+            'color': self.color_extractor.extract_features(img),
+            'sift': self.sift_extractor.extract_features(gray),
+            'ssim': self.ssim_extractor.extract_features(gray),
+            'edge': self.edge_extractor.extract_features(gray),
+            'shape': self.shape_extractor.extract_features(gray)
+        }
+    
     def _load_and_preprocess_images(self, path1: str, path2: str) -> Tuple[np.ndarray, np.ndarray]:
         """Load and preprocess images for comparison."""
         try:
@@ -96,40 +163,30 @@ class ImageSimilarityCalculator:
     
     def _calculate_all_similarities(self, img1: np.ndarray, img2: np.ndarray) -> List[Tuple[str, float, float]]:
         """Calculate all similarity metrics."""
-        # Convert to grayscale for some operations
-        gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
-        
+        return self._score_features(self._extract_all_features(img1), self._extract_all_features(img2))
+    
+    def _score_features(self, features1: Dict, features2: Dict) -> List[Tuple[str, float, float]]:
+        """Calculate all similarity metrics from pre-extracted features."""
         similarities = []
         
         # 1. Color Histogram Comparison
-        color_features1 = self.color_extractor.extract_features(img1)
-        color_features2 = self.color_extractor.extract_features(img2)
-        color_score = self.color_extractor.calculate_similarity(color_features1, color_features2)
+        color_score = self.color_extractor.calculate_similarity(features1['color'], features2['color'])
         similarities.append(('Color', color_score, self.config.COLOR_WEIGHT))
         
         # 2. SIFT Feature Matching
-        sift_features1 = self.sift_extractor.extract_features(gray1)
-        sift_features2 = self.sift_extractor.extract_features(gray2)
-        sift_score = self.sift_extractor.calculate_similarity(sift_features1, sift_features2)
+        sift_score = self.sift_extractor.calculate_similarity(features1['sift'], features2['sift'])
         similarities.append(('SIFT', sift_score, self.config.SIFT_WEIGHT))
         
         # 3. Structural Similarity
-        ssim_features1 = self.ssim_extractor.extract_features(gray1)
-        ssim_features2 = self.ssim_extractor.extract_features(gray2)
-        ssim_score = self.ssim_extractor.calculate_similarity(ssim_features1, ssim_features2)
+        ssim_score = self.ssim_extractor.calculate_similarity(features1['ssim'], features2['ssim'])
         similarities.append(('SSIM', ssim_score, self.config.SSIM_WEIGHT))
         
         # 4. Edge Detection Similarity
-        edge_features1 = self.edge_extractor.extract_features(gray1)
-        edge_features2 = self.edge_extractor.extract_features(gray2)
-        edge_score = self.edge_extractor.calculate_similarity(edge_features1, edge_features2)
+        edge_score = self.edge_extractor.calculate_similarity(features1['edge'], features2['edge'])
         similarities.append(('Edge', edge_score, self.config.EDGE_WEIGHT))
         
         # 5. Shape Analysis
-        shape_features1 = self.shape_extractor.extract_features(gray1)
-        shape_features2 = self.shape_extractor.extract_features(gray2)
-        shape_score = self.shape_extractor.calculate_similarity(shape_features1, shape_features2)
+        shape_score = self.shape_extractor.calculate_similarity(features1['shape'], features2['shape'])
         similarities.append(('Shape', shape_score, self.config.SHAPE_WEIGHT))
         
         return similarities
@@ -143,34 +200,32 @@ class ImageSimilarityCalculator:
         # print(f"   Final Score: {total_score:.3f}")
         pass
     
-    def get_detailed_analysis(self, image_path1: str, image_path2: str) -> Dict:
+    def get_detailed_analysis(self, image_path1: Union[str, np.ndarray], image_path2: Union[str, np.ndarray]) -> Dict:
         """
         Get detailed analysis of image similarity.
         
         Args:
-            image_path1: Path to first image file
-            image_path2: Path to second image file
+            image_path1: Path to first image file, or an already decoded BGR image
+            image_path2: Path to second image file, or an already decoded BGR image
             
         Returns:
             Dictionary with detailed analysis results
         """
         try:
             # Load images for metadata
-            img1 = cv2.imread(image_path1)
-            img2 = cv2.imread(image_path2)
+            img1 = image_path1 if isinstance(image_path1, np.ndarray) else cv2.imread(image_path1)
+            img2 = image_path2 if isinstance(image_path2, np.ndarray) else cv2.imread(image_path2)
             
             if img1 is None or img2 is None:
-                return {"error": f"Could not load images: {image_path1} or {image_path2}"}
-            
-            # Calculate similarity
-            similarity_score = self.calculate_similarity(image_path1, image_path2)
+                return {"error": "Could not load images"}
             
-            # Get individual metrics
-            img1_resized, img2_resized = self._load_and_preprocess_images(image_path1, image_path2)
-            gray1 = cv2.cvtColor(img1_resized, cv2.COLOR_BGR2GRAY)
-            gray2 = cv2.cvtColor(img2_resized, cv2.COLOR_BGR2GRAY)
-            
-            similarities = self._calculate_all_similarities(img1_resized, img2_resized)
+            # Get individual metrics from cached features
+            similarities = self._score_features(
+                self.get_image_features(image_path1),
+                self.get_image_features(image_path2)
+            )
+            total_score = sum(score * weight for _, score, weight in similarities)
+            similarity_score = min(1.0, max(0.0, total_score))
             
             return {
                 "similarity_score": round(similarity_score, 3),
@@ -1,23 +1,35 @@
 import os
 from pathlib import Path
-from google import genai
 from PIL import Image
 from dotenv import load_dotenv
 import json
-from typing import Dict, Optional, List
-from prompts.item_detection import get_image_analysis_prompt, get_price_search_prompt
+import numpy as np
+from typing import Dict, Optional, List, Union
+from prompts.item_detection import get_image_analysis_prompt, get_image_analysis_schema, get_price_search_prompt
 from prompts.product_name_extraction import get_product_name_extraction_prompt
 from llm_parser import parse_json_object, parse_json_list
-from groq import Groq
+from llm_clients import get_gemini_client, get_groq_client
+from llm_cache import cached_llm_call
 
 load_dotenv()
 
-def analyze_image(image_path: str, allow_repositioning: bool = True) -> Dict:
+# Grayscale standard deviation below which a frame is treated as blank
+# (covered camera, all-black/all-white frame)
+BLANK_IMAGE_STD_THRESHOLD = 5.0
+
+
+def is_blank_image(image: Image.Image) -> bool:
+    """Cheap check for uniform frames using a 64x64 grayscale thumbnail."""
+    arr = np.asarray(image.resize((64, 64)).convert('L'), dtype=np.uint8)
+    return float(arr.std()) < BLANK_IMAGE_STD_THRESHOLD
+
+
+def analyze_image(image_path: Union[str, Image.Image], allow_repositioning: bool = True) -> Dict:
     """
     Analyze an image to detect what it contains (person, product, text, or other).
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, or an already loaded PIL image
         allow_repositioning: Whether to allow repositioning suggestions
         
     Returns:
@@ -32,25 +44,42 @@ def analyze_image(image_path: str, allow_repositioning: bool = True) -> Dict:
         }
     """
     try:
-        # Check if image exists
-        if not Path(image_path).exists():
-            raise FileNotFoundError(f"Image not found: {image_path}")
+        if isinstance(image_path, Image.Image):
+            # Caller already decoded it - no second read from disk
+            image = image_path
+        else:
+            # Check if image exists
+            if not Path(image_path).exists():
+                raise FileNotFoundError(f"Image not found: {image_path}")
+            image = Image.open(image_path)
         
-        # Get Gemini client
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
+        # Skip the LLM call entirely for blank frames
+        if is_blank_image(image):
+            result = {
+                "type": "other",
+                "name": "Blank",
+                "confidence": "High",
+                "description": "The image appears to be blank or the camera is covered"
+            }
+            if allow_repositioning:
+                result["needs_repositioning"] = True
+                result["repositioning_instructions"] = "The image looks blank. Make sure the camera is uncovered and pointed at the item."
+            return result
         
-        client = genai.Client(api_key=api_key)
+        # Get Gemini client
+        client = get_gemini_client()
         
         # Get analysis prompt
         prompt = get_image_analysis_prompt(allow_repositioning)
         
-        # Load and analyze image
-        image = Image.open(image_path)
+        # Analyze image
         response = client.models.generate_content(
             model="gemini-2.0-flash-lite",
-            contents=[prompt, image]
+            contents=[prompt, image],
+            config={
+                "response_mime_type": "application/json",
+                "response_schema": get_image_analysis_schema(allow_repositioning)
+            }
         )
         
         # Parse JSON response
@@ -72,6 +101,68 @@ def analyze_image(image_path: str, allow_repositioning: bool = True) -> Dict:
         }
 
 
+# Prices move, product names don't
+PRICE_RESPONSE_TTL = 6 * 3600
+PRODUCT_NAME_RESPONSE_TTL = 30 * 86400
+
+
+def _has_price(response_text: str) -> bool:
+    """Whether a price search response parses to a non-zero price range (worth caching)."""
+    try:
+        result = parse_json_object(response_text)
+        return bool(float(result.get("min_price", 0)) or float(result.get("max_price", 0)))
+    except Exception:
+        return False
+
+
+# Only usable answers are cached - like get_price_cached in main.py, a [0, 0] is retried
+@cached_llm_call(model="gemini-flash-latest", ttl=PRICE_RESPONSE_TTL, cache_if=_has_price)
+def search_price(client, prompt: str) -> str:
+    """
+    Run the price search prompt on Gemini with Google Search enabled.
+    
+    Args:
+        client: Gemini client instance
+        prompt: The price search prompt
+        
+    Returns:
+        str: The model's response text
+    """
+    from google.genai import types
+    
+    # Configure with Google Search tool
+    tools = [
+        types.Tool(googleSearch=types.GoogleSearch())
+    ]
+    
+    # Configure generation with tools
+    generate_content_config = types.GenerateContentConfig(
+        tools=tools,
+        thinking_config=types.ThinkingConfig(
+            thinking_budget=2048,
+        )
+    )
+    
+    # Create content
+    contents = [
+        types.Content(
+            role="user",
+            parts=[
+                types.Part.from_text(text=prompt),
+            ],
+        ),
+    ]
+
+    # Call Gemini Flash Lite model with search
+    response = client.models.generate_content(
+        model="gemini-flash-latest",
+        contents=contents,
+        config=generate_content_config
+    )
+    
+    return response.text
+
+
 def get_price(product_name: str) -> List[float]:
     """
     Get the price range of an item using Gemini with web search.
@@ -89,51 +180,19 @@ def get_price(product_name: str) -> List[float]:
         [1199.0, 1299.0]
     """
     try:
-        from google.genai import types
-        
         # Get Gemini API key
         api_key = os.environ.get("GEMINI_API_KEY")
         if not api_key:
             print("Warning: GEMINI_API_KEY not found in environment variables")
             return [0, 0]
         
-        # Create Gemini client
-        client = genai.Client(api_key=api_key)
+        # Shared Gemini client
+        client = get_gemini_client()
         
         # Get prompt for price search
         prompt = get_price_search_prompt(product_name)
         
-        # Configure with Google Search tool
-        tools = [
-            types.Tool(googleSearch=types.GoogleSearch())
-        ]
-        
-        # Configure generation with tools
-        generate_content_config = types.GenerateContentConfig(
-            tools=tools,
-            thinking_config=types.ThinkingConfig(
-                thinking_budget=2048,
-            )
-        )
-        
-        # Create content
-        contents = [
-            types.Content(
-                role="user",
-                parts=[
-                    types.Part.from_text(text=prompt),
-                ],
-            ),
-        ]
-
-        # Call Gemini Flash Lite model with search
-        response = client.models.generate_content(
-            model="gemini-flash-latest",
-            contents=contents,
-            config=generate_content_config
-        )
-        
-        response_text = response.text
+        response_text = search_price(client, prompt)
 
         # Parse JSON response
         result = parse_json_object(response_text)
@@ -152,6 +211,20 @@ def get_price(product_name: str) -> List[float]:
         return [0, 0]
 
 
+@cached_llm_call(model="llama-3.1-8b-instant", ttl=PRODUCT_NAME_RESPONSE_TTL, temperature=0.1)
+def complete_product_name(client, prompt: str) -> str:
+    """Run the product name extraction prompt on Groq and return the raw completion."""
+    response = client.chat.completions.create(
+        model="llama-3.1-8b-instant",
+        messages=[
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.1,
+        max_tokens=100
+    )
+    return response.choices[0].message.content
+
+
 def extract_product_name(product_name: str) -> str:
     """
     Extract clean product name using Groq.
@@ -167,20 +240,11 @@ def extract_product_name(product_name: str) -> str:
         Cleaned product name
     """
     try:
-        client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+        client = get_groq_client()
         
         prompt = get_product_name_extraction_prompt(product_name)
         
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            max_tokens=100
-        )
-        
-        cleaned_name = response.choices[0].message.content.strip()
+        cleaned_name = complete_product_name(client, prompt).strip()
         # Remove quotes if present
         cleaned_name = cleaned_name.strip('"').strip("'")
         
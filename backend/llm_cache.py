@@ -0,0 +1,130 @@
+import functools
+import hashlib
+import inspect
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Optional
+
+# Responses of deterministic, text-only LLM calls, shared across worker processes
+LLM_CACHE_DB = "llm_cache.db"
+
+
+class LLMResponseCache:
+    """
+    SQLite store of raw LLM response text keyed by SHA-256(model, temperature, prompt).
+
+    Responses are zlib-compressed and carry their own expiry, so long-lived
+    entries (product names) and time-sensitive ones (prices, person research)
+    can share one table.
+    """
+
+    def __init__(self, db_path: str = LLM_CACHE_DB):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                response BLOB NOT NULL,
+                expires_at REAL
+            )
+        ''')
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections can't be shared across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: Optional[float] = None) -> str:
+        """Cache key for one call: SHA-256 over the model, temperature and prompt text."""
+        return hashlib.sha256(f"{model}\0{temperature}\0{prompt}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text for key, or None if missing/expired."""
+        row = self._connect().execute(
+            'SELECT response FROM llm_responses WHERE key = ? AND (expires_at IS NULL OR expires_at >= ?)',
+            (key, time.time())
+        ).fetchone()
+        return zlib.decompress(row[0]).decode() if row else None
+
+    def set(self, key: str, response: str, ttl: Optional[float]) -> None:
+        """Store response under key for ttl seconds (None = never expires)."""
+        expires_at = time.time() + ttl if ttl is not None else None
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO llm_responses (key, response, expires_at) VALUES (?, ?, ?)',
+            (key, zlib.compress(response.encode()), expires_at)
+        )
+        conn.execute('DELETE FROM llm_responses WHERE expires_at < ?', (time.time(),))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the shared response cache, creating the database on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache()
+        return _cache
+
+
+def cached_llm_call(model: str, ttl: Optional[float], temperature: Optional[float] = None,
+                    prompt_arg: str = "prompt",
+                    cache_if: Optional[Callable[[str], bool]] = None) -> Callable:
+    """
+    Cache the text returned by a function that sends one prompt to an LLM.
+
+    Only use on calls whose prompt fully determines the answer (no images).
+    The key hashes the prompt text itself, so editing a prompt template
+    invalidates its old entries. Empty responses and exceptions are not cached.
+
+    Args:
+        model: Model the wrapped function calls (part of the key)
+        ttl: Seconds a response stays valid (None = never expires)
+        temperature: Sampling temperature the wrapped function uses (part of the key)
+        prompt_arg: Name of the wrapped function's prompt parameter
+        cache_if: Only cache responses for which this returns True (e.g. ones that
+            parse), so a malformed answer is retried instead of pinned for the ttl
+    """
+    def decorator(func: Callable[..., str]) -> Callable[..., str]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> str:
+            prompt = signature.bind(*args, **kwargs).arguments[prompt_arg]
+            key = LLMResponseCache.make_key(model, prompt, temperature)
+
+            try:
+                cached = get_llm_cache().get(key)
+            except sqlite3.Error as e:
+                print(f"⚠️  LLM cache read failed: {e}")
+                cached = None
+            if cached is not None:
+                return cached
+
+            response = func(*args, **kwargs)
+            if response and (cache_if is None or cache_if(response)):
+                try:
+                    get_llm_cache().set(key, response, ttl)
+                except sqlite3.Error as e:
+                    print(f"⚠️  LLM cache write failed: {e}")
+            return response
+
+        return wrapper
+    return decorator
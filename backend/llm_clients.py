@@ -0,0 +1,30 @@
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+from google import genai
+from groq import Groq
+
+load_dotenv()
+
+
+@lru_cache(maxsize=None)
+def get_gemini_client() -> genai.Client:
+    """
+    Return the shared Gemini client, creating it on first use.
+
+    Reusing one client keeps its HTTP connection pool (and TLS sessions) warm
+    across requests instead of rebuilding it for every call.
+    """
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in environment variables")
+    return genai.Client(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def get_groq_client() -> Groq:
+    """Return the shared Groq client, creating it on first use."""
+    api_key = os.environ.get("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY not found in environment variables")
+    return Groq(api_key=api_key)
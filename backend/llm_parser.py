@@ -2,6 +2,28 @@ import json
 import re
 from typing import List, Dict, Any, Union
 
+try:
+    # SIMD-accelerated; its JSONDecodeError subclasses json.JSONDecodeError
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+# Compiled once - every LLM response goes through these
+_JSON_FENCE_RE = re.compile(r'```json\s*\n(.*?)\n```', re.DOTALL)
+_ARRAY_RE = re.compile(r'\[(.*?)\]', re.DOTALL)
+_OBJECT_RE = re.compile(r'\{(.*?)\}', re.DOTALL)
+
+
+def _loads_bare(text: str, opening: str) -> Any:
+    """Parse text as JSON if it is nothing but a JSON value starting with opening, else None."""
+    stripped = text.strip()
+    if not stripped.startswith(opening):
+        return None
+    try:
+        return _loads(stripped)
+    except ValueError:
+        return None
+
 
 def parse_json_list(text: str) -> List[str]:
     """
@@ -17,16 +39,19 @@ def parse_json_list(text: str) -> List[str]:
     Raises:
         ValueError: If no valid JSON list is found
     """
+    # Structured-output responses are bare JSON - parse them directly
+    parsed = _loads_bare(text, '[')
+    if isinstance(parsed, list):
+        return parsed
+    
     # First try to find ```json code block
-    json_pattern = r'```json\s*\n(.*?)\n```'
-    match = re.search(json_pattern, text, re.DOTALL)
+    match = _JSON_FENCE_RE.search(text)
     
     if match:
         json_text = match.group(1).strip()
     else:
         # Look for array pattern in the text
-        array_pattern = r'\[(.*?)\]'
-        match = re.search(array_pattern, text, re.DOTALL)
+        match = _ARRAY_RE.search(text)
         if match:
             json_text = f"[{match.group(1)}]"
         else:
@@ -50,7 +75,7 @@ def parse_json_list(text: str) -> List[str]:
         raise ValueError("No JSON list found in the text")
     
     try:
-        parsed = json.loads(json_text)
+        parsed = _loads(json_text)
         if isinstance(parsed, list):
             return parsed
         else:
@@ -73,17 +98,20 @@ def parse_json_object(text: str) -> Dict[str, Any]:
     Raises:
         ValueError: If no valid JSON object is found
     """
-    # First try to find ```json code block
     print(text)
-    json_pattern = r'```json\s*\n(.*?)\n```'
-    match = re.search(json_pattern, text, re.DOTALL)
+    # Structured-output responses are bare JSON - parse them directly
+    parsed = _loads_bare(text, '{')
+    if isinstance(parsed, dict):
+        return parsed
+    
+    # First try to find ```json code block
+    match = _JSON_FENCE_RE.search(text)
     
     if match:
         json_text = match.group(1).strip()
     else:
         # Look for object pattern in the text
-        object_pattern = r'\{(.*?)\}'
-        match = re.search(object_pattern, text, re.DOTALL)
+        match = _OBJECT_RE.search(text)
         if match:
             json_text = f"{{{match.group(1)}}}"
         else:
@@ -107,7 +135,7 @@ def parse_json_object(text: str) -> Dict[str, Any]:
         raise ValueError("No JSON object found in the text")
     
     try:
-        parsed = json.loads(json_text)
+        parsed = _loads(json_text)
         if isinstance(parsed, dict):
             return parsed
         else:
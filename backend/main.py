@@ -1,57 +1,525 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import base64
+from werkzeug.datastructures import FileStorage, MultiDict
+from werkzeug.exceptions import RequestEntityTooLarge
+import binascii
+import functools
+import logging
+import logging.handlers
 import os
+import queue
+import shutil
 import sys
+import tempfile
+import threading
+import time
 import uuid
-from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
+from typing import Optional, Union
+from concurrent.futures import Future, ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PIL import Image
+try:
+    # SIMD base64 codec (releases the GIL), much faster on multi-MB photos
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from binascii import a2b_base64 as _b64decode
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from item_detection import analyze_image, get_price, extract_product_name
 from criteria import criteria as get_criteria
 from counterfeit import counterfeit
 from generate_real_images import ReverseImageSearcher
 from upload_image import upload_image_to_supabase
+from cache_utils import TTLCache, file_digest, normalize_key, perceptual_hash
+from task_store import TaskStore
 from person import research_person_fakeness
 from fact_check import fact_check
+from ai_content import analyze_other_content
 from image_similarity_scores import ComparisonAnalyzer
 from ai_detection.model import DeepfakeModel
-from ai_detection.inference import is_deepfake
+from ai_detection.inference import get_batcher
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used for both jsonify and request.get_json."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for frontend communication
 
+# Log through a queue so request threads only enqueue records; formatting and
+# writing to stdout happen on the listener's background thread
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+logger = logging.getLogger("backend")
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.propagate = False
+
 # ============================================
 # CONFIGURATION - Adjust these as needed
 # ============================================
 DEEPFAKE_CONFIDENCE_THRESHOLD = 0.6  # Minimum confidence (0.0-1.0) to flag as AI-generated
+DEEPFAKE_MIN_PIXELS = 64 * 64  # Smaller images (thumbnails, placeholders) skip deepfake detection
+DEEPFAKE_MIN_FILE_BYTES = 2048  # Smaller files skip deepfake detection
+MAX_REQUEST_BYTES = 64 * 1024 * 1024  # Whole request body (/analyze carries several images)
+MAX_BASE64_IMAGE_LENGTH = 15 * 1024 * 1024  # Per base64 image (~11 MB decoded)
 # ============================================
 
+# Werkzeug rejects larger bodies before they are read or parsed
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+
 # Create uploads directory if it doesn't exist
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 SEARCHER = ReverseImageSearcher()
 SIMILARITY_ANALYZER = ComparisonAnalyzer()
 
-# Deepfake detection will be handled by the is_deepfake function
+# Deepfake detection is handled by the shared batcher from get_batcher()
+
+def _warmup():
+    """
+    Run a tiny dummy image through the similarity analyzer and deepfake model at
+    import time so weight loading, CUDA context creation and kernel autotuning
+    happen before the first real request instead of during it.
+    """
+    warm_path = Path(tempfile.gettempdir()) / "_warm.jpg"
+    try:
+        Image.new('RGB', (32, 32)).save(warm_path, format='JPEG')
+        SIMILARITY_ANALYZER.compare_images(str(warm_path), str(warm_path), threshold=0.7)
+        get_batcher().submit(str(warm_path), 0.5).result()
+        logger.info("🔥 Models warmed up")
+    except Exception as e:
+        logger.warning("⚠️  Model warmup failed (first request will be slower): %s", e)
+    finally:
+        warm_path.unlink(missing_ok=True)
+
+_warmup()
+
+# Detection tasks live in SQLite (WAL) so multiple worker processes can share them
+DETECT_TASKS = TaskStore()
+# SHA-256 of uploaded image -> {"task": initial detection task, "response": /detect
+# response}, shared by all workers so a retried upload is recognised whichever process
+# receives it. A hit is copied into a new task under a fresh detection_id - the cached
+# detection_id is never handed out again
+DETECT_RESPONSES = TaskStore("detect_responses.db", ttl=3600)
+
+# Caches for deterministic, expensive lookups repeated across requests
+DEEPFAKE_CACHE = TTLCache(maxsize=4096, ttl=3600)  # perceptual image hash -> deepfake result
+PRICE_CACHE = TTLCache(maxsize=1024, ttl=3600)  # item name -> price range
+CRITERIA_CACHE = TTLCache(maxsize=1024, ttl=86400)  # normalized item name (with brand) -> criteria data
+SEARCH_CACHE = TTLCache(maxsize=1024, ttl=3600)  # SHA-256 of uploaded image -> reverse image search results
+DOWNLOAD_CACHE = TTLCache(maxsize=1024, ttl=3600)  # image URL -> local path it was downloaded to
+
+# Base64 characters decoded per chunk when writing uploads (must be a multiple of 4)
+BASE64_CHUNK_SIZE = 64 * 1024
+
+# Thread pools per worker process (gunicorn adds GUNICORN_THREADS request threads):
+#   EXECUTOR                     8   I/O-bound steps of /detect
+#   JOB_EXECUTOR                 4   ?async=1 jobs, plus up to MAX_QUEUED_JOBS waiting
+#   CRITERIA_PREFETCH_EXECUTOR   2   criteria prefetches started by /detect
+#   counterfeit.CRITERION_CHECK_EXECUTOR  16   per-criterion Gemini checks of /analyze
+# A job replays a request, so it uses the same pools as a synchronous request and
+# JOB_WORKERS bounds how much of them background work can hold at once.
+
+# Shared worker pool for the I/O-bound steps of /detect (uploads, LLM and search calls)
+EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# Background jobs for ?async=1 requests. A separate pool so queued jobs can never
+# starve the EXECUTOR futures they wait on; job state is in SQLite so any worker
+# process can answer /status polls.
+JOB_WORKERS = 4
+JOB_EXECUTOR = ThreadPoolExecutor(max_workers=JOB_WORKERS)
+# Running plus queued jobs per process; beyond this ?async=1 requests get a 503
+MAX_QUEUED_JOBS = 16
+JOB_SLOTS = threading.BoundedSemaphore(JOB_WORKERS + MAX_QUEUED_JOBS)
+JOBS = TaskStore("jobs.db")
+
+# Criteria lookups in progress, so /criteria joins the one /detect started
+CRITERIA_IN_FLIGHT = {}  # normalized item name -> Future of criteria data
+CRITERIA_IN_FLIGHT_LOCK = threading.Lock()
+
+# Criteria prefetches from /detect get their own small pool - they are the slowest
+# call in the system and must never queue ahead of work a request is blocked on in
+# EXECUTOR. When every slot is busy the prefetch is skipped; /criteria then runs
+# the lookup itself.
+CRITERIA_PREFETCH_WORKERS = 2
+CRITERIA_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=CRITERIA_PREFETCH_WORKERS, thread_name_prefix="criteria-prefetch")
+CRITERIA_PREFETCH_SLOTS = threading.BoundedSemaphore(CRITERIA_PREFETCH_WORKERS)
+
+# Shared HTTP session so keepalive connections are reused across downloads
+HTTP_SESSION = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=100,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+)
+HTTP_SESSION.mount('https://', _http_adapter)
+HTTP_SESSION.mount('http://', _http_adapter)
 
-DETECT_TASKS = {}
+def _sendfile_all(src_fd: int, dst_fd: int) -> None:
+    """Copy the whole of src_fd into dst_fd with os.sendfile (no userspace buffers)."""
+    size = os.fstat(src_fd).st_size
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+def fast_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """Copy a file in-kernel with os.sendfile where available, falling back to shutil.copyfile."""
+    if not hasattr(os, 'sendfile'):
+        shutil.copyfile(src, dst)
+        return
+    
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        _sendfile_all(s.fileno(), d.fileno())
+
+def save_upload(upload: FileStorage, path: Path) -> None:
+    """
+    Save a multipart upload to path.
+    
+    Werkzeug spools large uploads to a temporary file; those are copied in-kernel
+    with os.sendfile instead of being read back through Python. Small in-memory
+    uploads fall back to FileStorage.save.
+    """
+    stream = upload.stream
+    src_fd = None
+    # fileno() on a SpooledTemporaryFile still held in memory would force it to disk first
+    if getattr(stream, '_rolled', True):
+        try:
+            src_fd = stream.fileno()
+        except (AttributeError, OSError):
+            pass
+    
+    if src_fd is None or not hasattr(os, 'sendfile'):
+        upload.save(path)
+        return
+    
+    stream.flush()
+    with open(path, 'wb') as d:
+        _sendfile_all(src_fd, d.fileno())
 
 def download_image(url: str, save_path: Path) -> bool:
     """Download an image from URL and save it to the specified path."""
+    # The same thumbnail is often returned for repeated scans - clone the local copy instead
+    cached_path = DOWNLOAD_CACHE.get(url)
+    if cached_path is not None:
+        try:
+            fast_copy(cached_path, save_path)
+            logger.info("✅ Copied cached image for %s to %s", url, save_path)
+            return True
+        except OSError as e:
+            logger.warning("⚠️  Cached copy of %s unavailable, downloading again: %s", url, e)
+    
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        with open(save_path, 'wb') as f:
-            f.write(response.content)
+        with HTTP_SESSION.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            
+            with open(save_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f)
         
-        print(f"✅ Downloaded image from {url} to {save_path}")
+        DOWNLOAD_CACHE.set(url, str(save_path))
+        logger.info("✅ Downloaded image from %s to %s", url, save_path)
         return True
     except Exception as e:
-        print(f"❌ Failed to download image from {url}: {str(e)}")
+        logger.error("❌ Failed to download image from %s: %s", url, e)
         return False
 
+def run_deepfake_detection(filepath: Path) -> dict:
+    """
+    Run the custom deepfake model on the locally saved image.
+    
+    Returns a dict with "is_deepfake", "probability" and "per_model" keys.
+    Values are None/empty if detection could not be performed, so a failed
+    check never blocks the rest of the detection flow.
+    """
+    result = {"is_deepfake": None, "probability": None, "per_model": {}}
+    
+    logger.info("🔍 Running deepfake detection...")
+    try:
+        # Use our model for detection with configured threshold; concurrent
+        # requests are batched into a single forward pass
+        detection = get_batcher().submit(str(filepath), DEEPFAKE_CONFIDENCE_THRESHOLD).result()
+        
+        # Extract results
+        probability = detection['raw_confidence']
+        per_model = {'custom_model': probability}
+        
+        logger.info("🤖 Deepfake detection result: %.2f%%", probability * 100)
+        logger.info("🤖 Detection details: %s", per_model)
+        logger.info("🤖 Model prediction: %s (confidence: %.2f%%)", detection['prediction'], detection['confidence'] * 100)
+        
+        result = {
+            "is_deepfake": detection['is_deepfake'],
+            "probability": probability,
+            "per_model": per_model
+        }
+        
+    except FileNotFoundError as e:
+        # Models not found - log warning but continue
+        logger.warning("⚠️  Deepfake detection skipped: %s", e)
+        logger.warning("   Continuing with normal detection flow...")
+    except Exception as e:
+        # Other errors - log but don't stop the flow
+        logger.warning("⚠️  Deepfake detection error: %s", e)
+        logger.warning("   Continuing with normal detection flow...")
+    
+    return result
+
+def write_base64_image(image_data: str, path: Path) -> None:
+    """
+    Decode a base64 image straight to path, dropping a data URL prefix
+    (e.g. "data:image/jpeg;base64,") if present.
+    
+    The payload is sliced and decoded in fixed-size chunks straight from the
+    request string, so neither a copy of the base64 text nor the full decoded
+    image is ever held in memory. Line-wrapped payloads (MIME base64 with
+    embedded newlines) misalign the chunks; those are decoded whole with the
+    whitespace stripped instead. A partially written file is removed on failure.
+    """
+    # Base64 never contains ',' - anything up to the first one is the data URL prefix
+    payload_start = image_data.find(',') + 1
+    
+    try:
+        with open(path, 'wb') as f:
+            try:
+                for start in range(payload_start, len(image_data), BASE64_CHUNK_SIZE):
+                    f.write(_b64decode(image_data[start:start + BASE64_CHUNK_SIZE]))
+            except binascii.Error:
+                f.seek(0)
+                f.truncate()
+                f.write(_b64decode(''.join(image_data[payload_start:].split())))
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+def save_criteria_image(detection_id: str, timestamp: int, idx: int, image: Union[str, FileStorage]) -> str:
+    """
+    Write one criteria image to the uploads directory and return its path.
+    The image is either a base64 string or a multipart file upload.
+    """
+    # Generate filename
+    filename = f"criteria_{detection_id}_{timestamp}_{idx}.jpg"
+    filepath = UPLOAD_DIR / filename
+    
+    # Save image
+    if isinstance(image, FileStorage):
+        save_upload(image, filepath)
+    else:
+        write_base64_image(image, filepath)
+    
+    logger.info("✅ Criteria image %d saved: %s", idx + 1, filepath)
+    return str(filepath)
+
+def compute_initial_scan(product_image_path: str, detection_image_path: str) -> Optional[dict]:
+    """Compare the reverse-search product image with the detection image."""
+    try:
+        logger.info("🔍 Calculating similarity between product image and detection image...")
+        similarity_result = SIMILARITY_ANALYZER.compare_images(
+            product_image_path,
+            detection_image_path,
+            threshold=0.7
+        )
+        
+        if "error" in similarity_result:
+            logger.warning("⚠️  Similarity calculation error: %s", similarity_result.get('error'))
+            return None
+        
+        initial_scan = {
+            "similarity_score": similarity_result.get("similarity_score", 0),
+            "match_status": similarity_result.get("match_status", "UNKNOWN"),
+            "confidence": similarity_result.get("analysis", {}).get("confidence", "Unknown"),
+            "interpretation": similarity_result.get("analysis", {}).get("interpretation", ""),
+            "recommendation": similarity_result.get("analysis", {}).get("recommendation", ""),
+            "counterfeit_risk": similarity_result.get("analysis", {}).get("counterfeit_risk", "Unknown")
+        }
+        logger.info("✅ Initial scan similarity: %.3f", initial_scan['similarity_score'])
+        return initial_scan
+    except Exception as e:
+        logger.warning("⚠️  Failed to calculate similarity: %s", e)
+        return None
+
+def get_criteria_cached(item_name: str) -> dict:
+    """get_criteria behind CRITERIA_CACHE."""
+    criteria_key = normalize_key(item_name)
+    criteria_data = CRITERIA_CACHE.get(criteria_key)
+    if criteria_data is None:
+        criteria_data = get_criteria(item_name)
+        CRITERIA_CACHE.set(criteria_key, criteria_data)
+    return criteria_data
+
+def _forget_criteria_lookup(criteria_key: str, future: Future) -> None:
+    """Done callback: drop a finished lookup from CRITERIA_IN_FLIGHT."""
+    with CRITERIA_IN_FLIGHT_LOCK:
+        if CRITERIA_IN_FLIGHT.get(criteria_key) is future:
+            del CRITERIA_IN_FLIGHT[criteria_key]
+
+def criteria_future(item_name: str, prefetch: bool = False) -> Optional[Future]:
+    """
+    Look up criteria for an item, or join the lookup already running for it.
+    
+    /detect prefetches (prefetch=True) as soon as a product is identified, so by
+    the time the client calls /criteria the slow LLM call is already under way
+    (or done). Prefetches run on CRITERIA_PREFETCH_EXECUTOR and are skipped (None is
+    returned) when all its slots are busy. Otherwise the lookup runs in the
+    calling thread and the returned future is already resolved.
+    """
+    criteria_key = normalize_key(item_name)
+    with CRITERIA_IN_FLIGHT_LOCK:
+        future = CRITERIA_IN_FLIGHT.get(criteria_key)
+        if future is not None:
+            return future
+        
+        if prefetch:
+            if not CRITERIA_PREFETCH_SLOTS.acquire(blocking=False):
+                logger.info("⏭️  Criteria prefetch pool busy, skipping prefetch for %s", item_name)
+                return None
+            future = CRITERIA_PREFETCH_EXECUTOR.submit(get_criteria_cached, item_name)
+            future.add_done_callback(lambda _: CRITERIA_PREFETCH_SLOTS.release())
+        else:
+            future = Future()
+        CRITERIA_IN_FLIGHT[criteria_key] = future
+    
+    # Registered outside the lock - a callback on an already finished future runs immediately
+    future.add_done_callback(lambda f: _forget_criteria_lookup(criteria_key, f))
+    
+    if not prefetch:
+        try:
+            future.set_result(get_criteria_cached(item_name))
+        except Exception as e:
+            future.set_exception(e)
+    return future
+
+def get_price_cached(item_name: str) -> list:
+    """get_price with failed lookups ([0, 0]) left uncached so they are retried."""
+    price_range = PRICE_CACHE.get(item_name)
+    if price_range is None:
+        price_range = get_price(item_name)
+        if any(price_range):
+            PRICE_CACHE.set(item_name, price_range)
+    return price_range
+
+def search_product(filepath: Path, image_url: Optional[str], digest: str) -> list:
+    """
+    Run a reverse image search on the already uploaded detection image.
+    
+    Results decide product identity and price, so they are cached by the exact
+    content hash - never by the perceptual hash, which collides for similar products.
+    """
+    cached_results = SEARCH_CACHE.get(digest)
+    if cached_results is not None:
+        logger.info("🔍 Using cached reverse image search results")
+        return cached_results
+    
+    try:
+        if not image_url:
+            # Initial upload failed - retry it once
+            image_url = upload_image_to_supabase(str(filepath), custom_filename=filepath.name, content_addressed=True)
+        search_results = SEARCHER.search_by_image_url(image_url, max_results=10)
+        if search_results:
+            SEARCH_CACHE.set(digest, search_results)
+        return search_results
+    except Exception as e:
+        logger.warning("⚠️  Reverse image search failed: %s", e)
+        return []
+
+def run_as_job(view):
+    """
+    Let a slow endpoint run in the background when called with ?async=1.
+    
+    The request is replayed into a fresh request context on JOB_EXECUTOR and the
+    client gets a task id straight away to poll via GET /status/<task_id>.
+    Uploaded files are saved to disk first (in-kernel for spooled uploads) and
+    handed to the job as file-backed uploads, so multipart bodies are never held
+    in memory. When MAX_QUEUED_JOBS are already waiting the request is rejected
+    with a 503. Without the query parameter the endpoint behaves exactly as before.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.args.get('async') not in ('1', 'true'):
+            return view(*args, **kwargs)
+        
+        if not JOB_SLOTS.acquire(blocking=False):
+            logger.warning("⚠️  Background job queue full, rejecting %s", request.path)
+            response = jsonify({"error": "Too many background jobs queued, please retry later"})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+        
+        task_id = uuid.uuid4().hex
+        path, method, content_type = request.path, request.method, request.content_type
+        body, form, files = None, None, []
+        try:
+            if request.mimetype in ('multipart/form-data', 'application/x-www-form-urlencoded'):
+                form = request.form.copy()
+                for idx, (field, upload) in enumerate(request.files.items(multi=True)):
+                    file_path = UPLOAD_DIR / f"job_{task_id}_{idx}"
+                    files.append((field, file_path, upload.filename, upload.content_type))
+                    save_upload(upload, file_path)
+            else:
+                # JSON bodies were already read into memory to be parsed
+                body = request.get_data()
+            JOBS[task_id] = {"status": "PENDING"}
+        except BaseException:
+            for _, file_path, _, _ in files:
+                file_path.unlink(missing_ok=True)
+            JOB_SLOTS.release()
+            raise
+        
+        def run():
+            streams = []
+            try:
+                with app.test_request_context(path, method=method, data=body, content_type=content_type):
+                    try:
+                        if form is not None:
+                            # Serve the saved files as the request's uploads instead of re-parsing a body
+                            uploads = MultiDict()
+                            for field, file_path, filename, file_content_type in files:
+                                stream = open(file_path, 'rb')
+                                streams.append(stream)
+                                uploads.add(field, FileStorage(stream, filename=filename, name=field,
+                                                               content_type=file_content_type))
+                            job_request = request._get_current_object()
+                            job_request.form = form
+                            job_request.files = uploads
+                        
+                        response = app.make_response(view(*args, **kwargs))
+                        JOBS[task_id] = {
+                            "status": "SUCCESS",
+                            "status_code": response.status_code,
+                            "result": response.get_json(silent=True)
+                        }
+                    except Exception as e:
+                        logger.error("❌ Background job %s failed: %s", task_id, e)
+                        JOBS[task_id] = {"status": "FAILURE", "error": str(e)}
+            finally:
+                for stream in streams:
+                    stream.close()
+                for _, file_path, _, _ in files:
+                    file_path.unlink(missing_ok=True)
+                JOB_SLOTS.release()
+        
+        JOB_EXECUTOR.submit(run)
+        return jsonify({"task_id": task_id, "status": "PENDING"}), 202
+    
+    return wrapper
+
 # {
 #   "detection_id": { 
 #       "item": str, 
@@ -69,128 +537,125 @@ def health():
     """Health check endpoint"""
     return jsonify({"status": "ok", "message": "Backend is running"})
 
+@app.route('/status/<task_id>', methods=['GET'])
+def job_status(task_id: str):
+    """Poll a background job started with ?async=1."""
+    job = JOBS.get(task_id)
+    if job is None:
+        return jsonify({"error": "Task not found"}), 404
+    return jsonify({"task_id": task_id, **job})
+
 @app.route('/detect', methods=['POST'])
+@run_as_job
 def detect():
     """
     Step 1: Receive an image, detect the item, and return basic info.
-    Expects JSON with base64 encoded image.
+    Expects a multipart/form-data upload with an "image" file field (preferred),
+    or JSON with a base64 encoded image.
     """
     try:
-        data = request.get_json()
+        if 'image' in request.files:
+            image_file = request.files['image']
+        else:
+            data = request.get_json(silent=True)
+            
+            if not data or 'image' not in data:
+                return jsonify({"error": "No image provided"}), 400
+            
+            # Reject oversized payloads before allocating anything for the decode
+            if len(data['image']) > MAX_BASE64_IMAGE_LENGTH:
+                return jsonify({"error": "Image too large"}), 413
+            
+            image_file = None
         
-        if not data or 'image' not in data:
-            return jsonify({"error": "No image provided"}), 400
+        # Temporary name only - the upload is renamed to its content hash once written
+        filepath = UPLOAD_DIR / f"upload_{time.time_ns()}.jpg"
         
-        # Get base64 image data
-        image_data = data['image']
+        # Save image locally
+        if image_file is not None:
+            # Multipart upload - no JSON parse or base64 decode
+            save_upload(image_file, filepath)
+        else:
+            write_base64_image(data['image'], filepath)
         
-        # Remove data URL prefix if present (e.g., "data:image/jpeg;base64,")
-        if ',' in image_data:
-            image_data = image_data.split(',')[1]
+        # Content-address the upload so retries of the same photo share one file
+        digest = file_digest(filepath)
+        filename = f"{digest}.jpg"
+        os.replace(filepath, UPLOAD_DIR / filename)
+        filepath = UPLOAD_DIR / filename
         
-        # Decode base64 image
-        image_bytes = base64.b64decode(image_data)
+        logger.info("✅ Image saved: %s", filepath)
         
-        # Generate unique filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = f"upload_{timestamp}.jpg"
-        filepath = UPLOAD_DIR / filename
+        # Identical image seen recently - reuse its detection results, but under a new
+        # detection_id so each caller's /criteria and /analyze state stays separate
+        cached = DETECT_RESPONSES.get(digest)
+        if cached is not None and "task" in cached:
+            detection_id = uuid.uuid4().hex
+            DETECT_TASKS[detection_id] = cached["task"]
+            logger.info("♻️  Reusing detection results for identical upload as %s", detection_id)
+            return jsonify({**cached["response"], "detection_id": detection_id}), 200
         
-        # Save image locally
-        with open(filepath, 'wb') as f:
-            f.write(image_bytes)
+        # Decode once; item detection and the perceptual hash share the same pixels
+        image = Image.open(filepath)
+        image.load()
         
-        print(f"✅ Image saved: {filepath}")
+        # Start item detection in the background while deepfake detection runs on the local file
+        detection_future = EXECUTOR.submit(analyze_image, image, allow_repositioning=False)
         
-        # 🤖 DEEPFAKE DETECTION - Check if image is AI-generated before proceeding
-        print("🔍 Running deepfake detection...")
-        try:
-            # Upload image to get public URL for API
-            image_url = upload_image_to_supabase(str(filepath), custom_filename=filename)
-            if image_url:
-                print(f"📤 Uploaded image for detection: {image_url}")
-                
-                # Use our trained deepfake detection model
-                try:
-                    # Download image temporarily for local processing
-                    temp_image_path = UPLOAD_DIR / f"temp_{filename}"
-                    if download_image(image_url, temp_image_path):
-                        # Use our model for detection with configured threshold
-                        result = is_deepfake(str(temp_image_path), confidence_threshold=DEEPFAKE_CONFIDENCE_THRESHOLD)
-                        
-                        # Extract results
-                        is_deepfake_result = result['is_deepfake']
-                        probability = result['raw_confidence']
-                        prediction = result['prediction']
-                        confidence = result['confidence']
-                        
-                        per_model = {'custom_model': probability}
-                        
-                        print(f"🤖 Deepfake detection result: {probability:.2%}")
-                        print(f"🤖 Detection details: {per_model}")
-                        print(f"🤖 Model prediction: {prediction} (confidence: {confidence:.2%})")
-                        
-                        # Clean up temp file
-                        temp_image_path.unlink(missing_ok=True)
-                    else:
-                        raise Exception("Failed to download image for processing")
-                except Exception as e:
-                    print(f"⚠️  Custom model detection failed: {e}")
-                    # Fallback to SightEngine API (placeholder - implement if needed)
-                    print("⚠️  Fallback API not implemented")
-                    is_deepfake_result = None
-                    probability = None
-                    per_model = {}
-            
+        width, height = image.size
+        image_hash = perceptual_hash(image)
+        
+        if width * height < DEEPFAKE_MIN_PIXELS or filepath.stat().st_size < DEEPFAKE_MIN_FILE_BYTES:
+            # Thumbnails and placeholders aren't worth a model invocation
+            logger.info("⏭️  Image too small for deepfake detection (%dx%d), skipping", width, height)
+            deepfake_result = {"is_deepfake": False, "probability": 0.0, "per_model": {}}
+        else:
+            # Reuse the verdict for the same (or a re-saved) frame
+            deepfake_result = DEEPFAKE_CACHE.get(image_hash)
+            if deepfake_result is None:
+                deepfake_result = run_deepfake_detection(filepath)
+                if deepfake_result["probability"] is not None:
+                    DEEPFAKE_CACHE.set(image_hash, deepfake_result)
             else:
-                print("⚠️  Failed to upload image for detection")
-                is_deepfake_result = None
-                probability = None
-                per_model = {}
-            
-            # If detected as deepfake (probability >= threshold), return early with deepfake info
-            if is_deepfake_result and probability is not None and probability >= DEEPFAKE_CONFIDENCE_THRESHOLD:
-                print(f"⚠️  DEEPFAKE DETECTED with {probability:.2%} confidence")
-                
-                response = {
-                    "success": True,
-                    "is_deepfake": True,
-                    "deepfake_detection": {
-                        "is_deepfake": is_deepfake_result,
-                        "probability": probability,
-                        "confidence_level": "high" if probability > 0.75 else "medium" if probability > 0.5 else "low",
-                        "per_model_results": [
-                            {
-                                "model": model_name.replace("_image", "").replace("_", " ").title(),
-                                "probability": prob,
-                                "detected_as_fake": prob > 0.5 if prob is not None else None
-                            }
-                            for model_name, prob in per_model.items()
-                        ],
-                        "average_probability": probability,
-                        "message": "This image appears to be AI-generated or manipulated.",
-                        "warning": "The content in this image may not be authentic."
-                    },
-                    "filename": filename
-                }
-                
-                return jsonify(response), 200
+                logger.info("🤖 Using cached deepfake detection result")
+        is_deepfake_result = deepfake_result["is_deepfake"]
+        probability = deepfake_result["probability"]
+        per_model = deepfake_result["per_model"]
+        
+        # If detected as deepfake (probability >= threshold), return early with deepfake info
+        if is_deepfake_result and probability is not None and probability >= DEEPFAKE_CONFIDENCE_THRESHOLD:
+            logger.warning("⚠️  DEEPFAKE DETECTED with %.2f%% confidence", probability * 100)
             
-            # If not a deepfake, log and continue with normal detection
-            if probability is not None:
-                print(f"✅ Image appears authentic ({(1-probability):.2%} confidence)")
+            response = {
+                "success": True,
+                "is_deepfake": True,
+                "deepfake_detection": {
+                    "is_deepfake": is_deepfake_result,
+                    "probability": probability,
+                    "confidence_level": "high" if probability > 0.75 else "medium" if probability > 0.5 else "low",
+                    "per_model_results": [
+                        {
+                            "model": model_name.replace("_image", "").replace("_", " ").title(),
+                            "probability": prob,
+                            "detected_as_fake": prob > 0.5 if prob is not None else None
+                        }
+                        for model_name, prob in per_model.items()
+                    ],
+                    "average_probability": probability,
+                    "message": "This image appears to be AI-generated or manipulated.",
+                    "warning": "The content in this image may not be authentic."
+                },
+                "filename": filename
+            }
             
-        except FileNotFoundError as e:
-            # Models not found - log warning but continue
-            print(f"⚠️  Deepfake detection skipped: {str(e)}")
-            print("   Continuing with normal detection flow...")
-        except Exception as e:
-            # Other errors - log but don't stop the flow
-            print(f"⚠️  Deepfake detection error: {str(e)}")
-            print("   Continuing with normal detection flow...")
+            return jsonify(response), 200
+        
+        # If not a deepfake, log and continue with normal detection
+        if probability is not None:
+            logger.info("✅ Image appears authentic (%.2f%% confidence)", (1 - probability) * 100)
         
-        # Use item_detection.py to analyze the image
-        detection_result = analyze_image(str(filepath), allow_repositioning=False)
+        # Use item_detection.py result (analyzed in parallel with deepfake detection)
+        detection_result = detection_future.result()
         
         # Check if repositioning is needed
         if detection_result.get("needs_repositioning"):
@@ -205,8 +670,8 @@ def detect():
         # Get the detected item information
         item_type = detection_result.get("type", "other")
         item_name = detection_result.get("name", "")
-        print(f"✅ Detected item type: {item_type}")
-        print(f"✅ Detected item name: {item_name}")
+        logger.info("✅ Detected item type: %s", item_type)
+        logger.info("✅ Detected item name: %s", item_name)
         
         if not item_name:
             return jsonify({
@@ -215,50 +680,71 @@ def detect():
             }), 400
         
         # Generate unique detection_id
-        detection_id = str(uuid.uuid4())
+        detection_id = uuid.uuid4().hex
         
         # Branch based on detected type
         if item_type == "product":
-            print("🛍️  Product detected - following product workflow")
+            logger.info("🛍️  Product detected - following product workflow")
             
             # Use reverse image search to find product URL and images
             product_url = None
             product_image = None
             product_image_path = None
-            uploaded_image_url = upload_image_to_supabase(str(filepath))    
-            search_results = SEARCHER.search_by_image_url(uploaded_image_url, max_results=10)
+            
+            # The Supabase upload is only needed for reverse image search - skip it when the
+            # results for this frame are already cached, otherwise overlap it with the price lookup
+            upload_future = None
+            if SEARCH_CACHE.get(digest) is None:
+                upload_future = EXECUTOR.submit(
+                    upload_image_to_supabase, str(filepath), custom_filename=filename, content_addressed=True
+                )
+            
+            # Reverse image search and price lookup are independent - run them concurrently
+            price_future = EXECUTOR.submit(get_price_cached, item_name)
+            try:
+                image_url = upload_future.result() if upload_future is not None else None
+            except Exception as e:
+                logger.warning("⚠️  Failed to upload image: %s", e)
+                image_url = None
+            search_results = search_product(filepath, image_url, digest)
             
             if search_results:
                 # Get top result with highest trust score
-                top_result = max(search_results, key=lambda x: x.get('trust_score', 0))
+                top_result = max(search_results, key=itemgetter('trust_score'))
                 product_url = top_result.get('link', '')
                 product_image = top_result.get('thumbnail', '')
                 product_title = top_result.get('title', '')
                 
+                # Download the product image in the background while the name is cleaned up
+                download_future = None
+                if product_image:
+                    product_filename = f"product_{detection_id}.jpg"
+                    product_image_path = UPLOAD_DIR / product_filename
+                    download_future = EXECUTOR.submit(download_image, product_image, product_image_path)
+                
                 product_name = extract_product_name(product_title)
                 if product_name:
                     item_name = product_name
-                print(f"✅ Found product URL: {product_url}")
-                print(f"✅ Found product image: {product_image}")
-                print(f"✅ Found product name: {product_title}")
+                logger.info("✅ Found product URL: %s", product_url)
+                logger.info("✅ Found product image: %s", product_image)
+                logger.info("✅ Found product name: %s", product_title)
                 
-                # Download the product image
-                if product_image:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                    product_filename = f"product_{detection_id}_{timestamp}.jpg"
-                    product_image_path = UPLOAD_DIR / product_filename
-                    
-                    if download_image(product_image, product_image_path):
+                if download_future is not None:
+                    if download_future.result():
                         product_image_path = str(product_image_path)
                     else:
                         product_image_path = None
             else:
-                print("⚠️  No search results found")
+                logger.warning("⚠️  No search results found")
             
-            price_range = get_price(item_name)
+            # Criteria generation is the slowest call in the flow - start it now so it
+            # overlaps the price lookup and the client's round trip to /criteria
+            criteria_future(item_name, prefetch=True)
+            
+            price_range = price_future.result()
         
             # Store basic detection data (without criteria yet)
-            DETECT_TASKS[detection_id] = {
+            task = {
                 "item": item_name,
                 "item_type": item_type,
                 "item_detection_image": str(filepath),
@@ -271,6 +757,7 @@ def detect():
                 "location_angle": None,
                 "detailed_criteria": None
             }
+            DETECT_TASKS[detection_id] = task
             
             # Return detection info with product URL, image, and price range
             response = {
@@ -286,19 +773,21 @@ def detect():
                 "filename": filename
             }
             
+            DETECT_RESPONSES[digest] = {"task": task, "response": response}
             return jsonify(response), 200
             
         elif item_type == "person":
-            print("👤 Person detected - waiting for user to provide name")
+            logger.info("👤 Person detected - waiting for user to provide name")
             
             # Store basic detection data (waiting for user input)
-            DETECT_TASKS[detection_id] = {
+            task = {
                 "item": item_name,
                 "item_type": item_type,
                 "item_detection_image": str(filepath),
                 "detection_details": detection_result,
                 "awaiting_person_input": True
             }
+            DETECT_TASKS[detection_id] = task
             
             # Return detection info and prompt for user input
             response = {
@@ -312,22 +801,24 @@ def detect():
                 "message": "Person detected. Please provide their name and any additional information."
             }
             
+            DETECT_RESPONSES[digest] = {"task": task, "response": response}
             return jsonify(response), 200
             
         elif item_type == "text":
-            print("📄 Text/document detected - performing fact check")
+            logger.info("📄 Text/document detected - performing fact check")
             
             # Perform fact check on the image
             fact_check_result = fact_check(str(filepath))
             
             # Store detection data
-            DETECT_TASKS[detection_id] = {
+            task = {
                 "item": item_name,
                 "item_type": item_type,
                 "item_detection_image": str(filepath),
                 "detection_details": detection_result,
                 "fact_check_result": fact_check_result
             }
+            DETECT_TASKS[detection_id] = task
             
             # Return fact check results
             response = {
@@ -341,28 +832,29 @@ def detect():
                 "fact_check": fact_check_result
             }
             
+            DETECT_RESPONSES[digest] = {"task": task, "response": response}
             return jsonify(response), 200
             
         else:  # "other"
-            print("❓ Other content detected - using Gemini analysis as fallback")
+            logger.info("❓ Other content detected - using Gemini analysis as fallback")
             
             # Use Gemini to analyze the image
-            from ai_content import analyze_other_content
             gemini_analysis = analyze_other_content(str(filepath), item_name)
             
             # Log the analysis
-            print(f"✅ Gemini Analysis: {gemini_analysis.get('title', 'N/A')}")
-            print(f"   Category: {gemini_analysis.get('category', 'Unknown')}")
-            print(f"   Description: {gemini_analysis.get('description', 'N/A')[:100]}...")
+            logger.info("✅ Gemini Analysis: %s", gemini_analysis.get('title', 'N/A'))
+            logger.info("   Category: %s", gemini_analysis.get('category', 'Unknown'))
+            logger.info("   Description: %.100s...", gemini_analysis.get('description', 'N/A'))
             
             # Store detection data
-            DETECT_TASKS[detection_id] = {
+            task = {
                 "item": item_name,
                 "item_type": item_type,
                 "item_detection_image": str(filepath),
                 "detection_details": detection_result,
                 "gemini_analysis": gemini_analysis
             }
+            DETECT_TASKS[detection_id] = task
             
             # Return success with basic info (frontend doesn't need to handle this specially)
             response = {
@@ -376,10 +868,13 @@ def detect():
                 "message": f"Analyzed: {gemini_analysis.get('title', item_name)}"
             }
             
+            DETECT_RESPONSES[digest] = {"task": task, "response": response}
             return jsonify(response), 200
         
+    except RequestEntityTooLarge:
+        return jsonify({"error": "Request too large"}), 413
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        logger.error("❌ Error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
@@ -400,18 +895,17 @@ def research_person():
         additional_info = data.get('additional_info', '')
         
         # Check if detection_id exists
-        if detection_id not in DETECT_TASKS:
+        task = DETECT_TASKS.get(detection_id)
+        if task is None:
             return jsonify({"error": "Detection ID not found"}), 404
         
-        task = DETECT_TASKS[detection_id]
-        
         # Verify this is a person detection
         if task.get("item_type") != "person":
             return jsonify({"error": "This detection is not for a person"}), 400
         
-        print(f"🔍 Researching person: {person_name}")
+        logger.info("🔍 Researching person: %s", person_name)
         if additional_info:
-            print(f"📝 Additional context: {additional_info}")
+            logger.info("📝 Additional context: %s", additional_info)
         
         # Combine person_name with additional_info for more context
         search_query = f"{person_name} {additional_info}".strip()
@@ -420,10 +914,12 @@ def research_person():
         person_research = research_person_fakeness(search_query)
         
         # Update task with research results
-        DETECT_TASKS[detection_id]["person_name"] = person_name
-        DETECT_TASKS[detection_id]["additional_info"] = additional_info
-        DETECT_TASKS[detection_id]["person_research"] = person_research
-        DETECT_TASKS[detection_id]["awaiting_person_input"] = False
+        DETECT_TASKS.update(detection_id, {
+            "person_name": person_name,
+            "additional_info": additional_info,
+            "person_research": person_research,
+            "awaiting_person_input": False
+        })
         
         # Return research results
         response = {
@@ -436,11 +932,12 @@ def research_person():
         return jsonify(response), 200
         
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        logger.error("❌ Error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/criteria/<detection_id>', methods=['POST'])
+@run_as_job
 def get_criteria_for_detection(detection_id):
     """
     Step 2: Get authentication criteria for a detected item (product workflow).
@@ -448,10 +945,10 @@ def get_criteria_for_detection(detection_id):
     """
     try:
         # Check if detection_id exists
-        if detection_id not in DETECT_TASKS:
+        task = DETECT_TASKS.get(detection_id)
+        if task is None:
             return jsonify({"error": "Detection ID not found"}), 404
         
-        task = DETECT_TASKS[detection_id]
         item_name = task["item"]
         
         # Get optional brand from request body
@@ -461,35 +958,38 @@ def get_criteria_for_detection(detection_id):
         # If brand specified, prepend to item name
         if brand:
             item_name_with_brand = f"{brand} {item_name}"
-            print(f"🏷️  Brand specified: {brand}, using '{item_name_with_brand}' for criteria")
-            task["brand"] = brand
+            logger.info("🏷️  Brand specified: %s, using '%s' for criteria", brand, item_name_with_brand)
+            task = DETECT_TASKS.update(detection_id, {"brand": brand})
         else:
             item_name_with_brand = item_name
         
         # Get criteria if not already cached in the task
         if task["criteria"] is None:
-            criteria_data = get_criteria(item_name_with_brand)
+            criteria_data = criteria_future(item_name_with_brand).result()
             
             # Update task with criteria (both simple and detailed formats)
-            DETECT_TASKS[detection_id]["criteria"] = criteria_data.get("criteria", [])
-            DETECT_TASKS[detection_id]["location_angle"] = criteria_data.get("location_angle", [])
-            DETECT_TASKS[detection_id]["detailed_criteria"] = criteria_data.get("detailed_criteria", [])
+            task = DETECT_TASKS.update(detection_id, {
+                "criteria": criteria_data.get("criteria", []),
+                "location_angle": criteria_data.get("location_angle", []),
+                "detailed_criteria": criteria_data.get("detailed_criteria", [])
+            })
         
         response = {
             "success": True,
             "detection_id": detection_id,
             "item": item_name,
-            "location_angle": DETECT_TASKS[detection_id]["location_angle"],
-            "detailed_criteria": DETECT_TASKS[detection_id].get("detailed_criteria", [])
+            "location_angle": task["location_angle"],
+            "detailed_criteria": task.get("detailed_criteria", [])
         }
         
         return jsonify(response), 200
         
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        logger.error("❌ Error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/analyze/<detection_id>', methods=['POST'])
+@run_as_job
 def analyze_item(detection_id: str):
     """
     Step 3: Analyze the item with criteria images.
@@ -497,48 +997,45 @@ def analyze_item(detection_id: str):
     """
     try:
         # Check if detection_id exists
-        if detection_id not in DETECT_TASKS:
+        task = DETECT_TASKS.get(detection_id)
+        if task is None:
             return jsonify({"error": "Detection ID not found"}), 404
         
-        task = DETECT_TASKS[detection_id]
-        
         # Validate that criteria exists
         if task["criteria"] is None or task["location_angle"] is None:
             return jsonify({"error": "Criteria not fetched yet. Call /criteria endpoint first."}), 400
         
-        data = request.get_json()
-        
-        if not data or 'images' not in data:
-            return jsonify({"error": "No images provided"}), 400
-        
-        # Get base64 images array
-        base64_images = data['images']
-        
-        if not isinstance(base64_images, list):
-            return jsonify({"error": "Images must be an array"}), 400
-        
-        # Save all criteria images
-        saved_image_paths = []
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        for idx, image_data in enumerate(base64_images):
-            # Remove data URL prefix if present
-            if ',' in image_data:
-                image_data = image_data.split(',')[1]
+        # Multipart uploads ("images" file fields) skip JSON parsing and base64 decoding
+        images = request.files.getlist('images')
+        if not images:
+            data = request.get_json(silent=True)
             
-            # Decode base64 image
-            image_bytes = base64.b64decode(image_data)
+            if not data or 'images' not in data:
+                return jsonify({"error": "No images provided"}), 400
             
-            # Generate filename
-            filename = f"criteria_{detection_id}_{timestamp}_{idx}.jpg"
-            filepath = UPLOAD_DIR / filename
+            # Get base64 images array
+            images = data['images']
             
-            # Save image
-            with open(filepath, 'wb') as f:
-                f.write(image_bytes)
+            if not isinstance(images, list):
+                return jsonify({"error": "Images must be an array"}), 400
             
-            saved_image_paths.append(str(filepath))
-            print(f"✅ Criteria image {idx + 1} saved: {filepath}")
+            if any(len(image) > MAX_BASE64_IMAGE_LENGTH for image in images):
+                return jsonify({"error": "Image too large"}), 413
+        
+        # The initial scan only needs images from /detect - run it alongside saving
+        # the criteria images and the counterfeit LLM calls
+        initial_scan_future = None
+        if task.get("product_image_path"):
+            initial_scan_future = EXECUTOR.submit(
+                compute_initial_scan, task["product_image_path"], task["item_detection_image"]
+            )
+        
+        # Decode and save all criteria images concurrently
+        timestamp = time.time_ns()
+        saved_image_paths = list(EXECUTOR.map(
+            lambda item: save_criteria_image(detection_id, timestamp, *item),
+            enumerate(images)
+        ))
         
         # Prepare criteria data for counterfeit analysis
         criteria_data = {
@@ -549,40 +1046,18 @@ def analyze_item(detection_id: str):
         # Add the original detection image to the analysis
         all_images = [task["item_detection_image"]] + saved_image_paths
         
-        # Calculate initial scan similarity between product image and detection image
-        initial_scan = None
-        if task.get("product_image_path") and os.path.exists(task["product_image_path"]):
-            try:
-                print(f"🔍 Calculating similarity between product image and detection image...")
-                similarity_result = SIMILARITY_ANALYZER.compare_images(
-                    task["product_image_path"],
-                    task["item_detection_image"],
-                    threshold=0.7
-                )
-                
-                if "error" not in similarity_result:
-                    initial_scan = {
-                        "similarity_score": similarity_result.get("similarity_score", 0),
-                        "match_status": similarity_result.get("match_status", "UNKNOWN"),
-                        "confidence": similarity_result.get("analysis", {}).get("confidence", "Unknown"),
-                        "interpretation": similarity_result.get("analysis", {}).get("interpretation", ""),
-                        "recommendation": similarity_result.get("analysis", {}).get("recommendation", ""),
-                        "counterfeit_risk": similarity_result.get("analysis", {}).get("counterfeit_risk", "Unknown")
-                    }
-                    print(f"✅ Initial scan similarity: {initial_scan['similarity_score']:.3f}")
-                else:
-                    print(f"⚠️  Similarity calculation error: {similarity_result.get('error')}")
-            except Exception as e:
-                print(f"⚠️  Failed to calculate similarity: {str(e)}")
-        
         # Use counterfeit.py to analyze
-        print(f"Analyzing {task['item']} with {len(all_images)} images...")
+        logger.info("Analyzing %s with %d images...", task['item'], len(all_images))
         analysis_result = counterfeit(task["item"], criteria_data, all_images)
         
+        initial_scan = initial_scan_future.result() if initial_scan_future is not None else None
+        
         # Store results in task
-        DETECT_TASKS[detection_id]["analysis_result"] = analysis_result
-        DETECT_TASKS[detection_id]["criteria_images"] = saved_image_paths
-        DETECT_TASKS[detection_id]["initial_scan"] = initial_scan
+        DETECT_TASKS.update(detection_id, {
+            "analysis_result": analysis_result,
+            "criteria_images": saved_image_paths,
+            "initial_scan": initial_scan
+        })
         
         # Return the results
         response = {
@@ -598,12 +1073,15 @@ def analyze_item(detection_id: str):
         
         return jsonify(response), 200
         
+    except RequestEntityTooLarge:
+        return jsonify({"error": "Request too large"}), 413
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        logger.error("❌ Error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
 if __name__ == '__main__':
+    # Development server only - in production run: gunicorn -c gunicorn_conf.py main:app
     port = int(os.environ.get('PORT', 5555))
     host = os.environ.get('HOST', '0.0.0.0')
     debug = os.environ.get('DEBUG', 'True').lower() == 'true'
@@ -612,5 +1090,5 @@ if __name__ == '__main__':
     print(f"📁 Upload directory: {UPLOAD_DIR.absolute()}")
     print(f"🌐 Running on {host}:{port}")
     
-    app.run(debug=debug, port=port, host=host)
+    app.run(debug=debug, port=port, host=host, threaded=True)
 
@@ -1,21 +1,17 @@
-import os
 from typing import Dict, Any
 from dotenv import load_dotenv
-from google import genai
 from prompts.person import get_person_fakeness_prompt
 from llm_parser import parse_json_object
+from llm_clients import get_gemini_client
+from llm_cache import cached_llm_call
 
 load_dotenv()
 
-
-def create_gemini_client():
-    """Create and return a Gemini client."""
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found in environment variables")
-    return genai.Client(api_key=api_key)
+# Reputations change, so research is only reused for a day
+PERSON_RESEARCH_TTL = 86400
 
 
+@cached_llm_call(model="gemini-flash-latest", ttl=PERSON_RESEARCH_TTL)
 def call_gemini_model(client, prompt: str) -> str:
     """
     Call Gemini model with Google Search enabled.
@@ -94,8 +90,8 @@ def research_person_fakeness(name: str) -> Dict[str, Any]:
             - positive_notes: list of positive context
     """
     try:
-        # Create client
-        client = create_gemini_client()
+        # Shared client
+        client = get_gemini_client()
         
         # Generate prompt (includes instruction to limit to 10 searches)
         prompt = get_person_fakeness_prompt(name)
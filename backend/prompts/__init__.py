@@ -0,0 +1,89 @@
+import json
+import re
+import sys
+import textwrap
+from importlib import resources
+from typing import Any
+
+try:
+    import orjson
+
+    def _dumps_compact(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps_compact(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _ENCODING = None
+
+# Closing instruction shared by the prompts that show a JSON format to copy
+RETURN_JSON_ONLY = sys.intern("Return ONLY valid JSON in the exact format shown above.")
+
+_FENCED_BLOCK_RE = re.compile(r"(```.*?```)", re.DOTALL)
+_TRAILING_SPACE_RE = re.compile(r"[ \t]+\n")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def clean_prompt(text: str) -> str:
+    """
+    Strip source-code whitespace from a prompt literal.
+
+    Dedents, drops trailing spaces and collapses runs of blank lines in the
+    prose. Fenced ``` blocks keep their line breaks and indentation so the
+    JSON examples still read as formatted JSON.
+
+    Args:
+        text: Prompt template as written in the source
+
+    Returns:
+        str: The prompt with leading/trailing whitespace removed
+    """
+    parts = _FENCED_BLOCK_RE.split(textwrap.dedent(text))
+    for i, part in enumerate(parts):
+        part = _TRAILING_SPACE_RE.sub("\n", part)
+        if not part.startswith("```"):
+            part = _BLANK_LINES_RE.sub("\n\n", part)
+        parts[i] = part
+    return "".join(parts).strip()
+
+
+def load_resource(name: str) -> str:
+    """
+    Read a few-shot block from prompts/resources/, with trailing whitespace removed.
+
+    Examples live in these files so few-shot sets can be swapped without code edits.
+    """
+    return resources.files(__name__).joinpath("resources", name).read_text(encoding="utf-8").strip()
+
+
+def dump_example(example: Any) -> str:
+    """
+    Serialize a few-shot example object to compact JSON for inlining in a prompt.
+
+    Runs at import, so an example that isn't JSON-serializable fails there
+    rather than in a request. The result is interned as it lives for the
+    whole process.
+    """
+    return sys.intern(_dumps_compact(example))
+
+
+def escape_braces(text: str) -> str:
+    """Double literal braces so text survives being part of a str.format template."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the token count of text for cost metering and budget checks.
+
+    Uses tiktoken's cl100k_base when installed, otherwise ~4 characters per
+    token. Gemini tokenizes differently, so treat this as an estimate.
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return (len(text) + 3) // 4
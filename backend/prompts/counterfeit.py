@@ -1,27 +1,16 @@
-def get_single_criterion_prompt(item: str, criterion: str, criterion_number: int, total_criteria: int) -> str:
-    """
-    Generate the prompt for analyzing a single criterion with a single image.
-    
-    Args:
-        item: The item name/type being authenticated
-        criterion: The specific authentication criterion to check
-        criterion_number: The number of this criterion (1-indexed)
-        total_criteria: Total number of criteria
-        
-    Returns:
-        str: The formatted prompt
-    """
-    return f"""
-# Goal
-You are an expert authenticator analyzing an image of a {item} to verify a SPECIFIC authentication criterion.
+from functools import lru_cache
 
-# Criterion to Verify (#{criterion_number} of {total_criteria})
-Focus ONLY on this specific authentication criterion:
+from prompts import clean_prompt
 
-**{criterion}**
+# Invariant instructions, sent as the system instruction so every per-criterion
+# call in an /analyze fan-out shares the same prefix (eligible for Gemini's
+# prefix caching); only SINGLE_CRITERION_PROMPT varies between calls
+SINGLE_CRITERION_SYSTEM_PROMPT = clean_prompt("""
+# Goal
+You are an expert authenticator analyzing an image of an item to verify a SPECIFIC authentication criterion.
 
 # Task
-Based on the provided image and your expert visual analysis, evaluate this ONE criterion.
+Based on the provided image and your expert visual analysis, evaluate ONLY the one criterion given in the request.
 Provide a confidence score from 1-5:
 - 5: Clearly authentic, matches expected quality perfectly
 - 4: Likely authentic, minor concerns but acceptable
@@ -32,15 +21,15 @@ Provide a confidence score from 1-5:
 # Format
 Return your analysis as a JSON object:
 ```json
-{{
-    "criterion": "{criterion}",
+{
+    "criterion": "The criterion being verified, exactly as given",
     "score": 1-5,
     "passed": true/false,
     "notes": "Brief explanation of what you observed in the image and why you gave this score",
     "confidence_percentage": 0-100,
     "visual_markers": ["marker1", "marker2"],
     "comparison_notes": "How it compares to authentic versions"
-}}
+}
 ```
 
 # Requirements:
@@ -51,4 +40,53 @@ Return your analysis as a JSON object:
 - Provide specific visual evidence for your score
 - Be thorough and fair in your assessment
 - Remember: you're only evaluating ONE criterion from ONE image
-"""
+""")
+
+# Response schema for the per-criterion calls, enforced by Gemini structured output
+SINGLE_CRITERION_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "criterion": {"type": "STRING"},
+        "score": {"type": "INTEGER", "minimum": 1, "maximum": 5},
+        "passed": {"type": "BOOLEAN"},
+        "notes": {"type": "STRING"},
+        "confidence_percentage": {"type": "NUMBER", "minimum": 0, "maximum": 100},
+        "visual_markers": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "comparison_notes": {"type": "STRING"},
+    },
+    "required": ["criterion", "score", "passed", "notes", "confidence_percentage"],
+}
+
+# Filled with str.format
+SINGLE_CRITERION_PROMPT = clean_prompt("""
+# Item
+{item}
+
+# Criterion to Verify (#{criterion_number} of {total_criteria})
+Focus ONLY on this specific authentication criterion:
+
+**{criterion}**
+""")
+
+
+@lru_cache(maxsize=2048)
+def get_single_criterion_prompt(item: str, criterion: str, criterion_number: int, total_criteria: int) -> str:
+    """
+    Generate the per-call part of the prompt for analyzing a single criterion with a
+    single image. Send it with SINGLE_CRITERION_SYSTEM_PROMPT as the system instruction.
+    
+    Args:
+        item: The item name/type being authenticated
+        criterion: The specific authentication criterion to check
+        criterion_number: The number of this criterion (1-indexed)
+        total_criteria: Total number of criteria
+        
+    Returns:
+        str: The formatted prompt
+    """
+    return SINGLE_CRITERION_PROMPT.format(
+        item=item,
+        criterion=criterion,
+        criterion_number=criterion_number,
+        total_criteria=total_criteria
+    )
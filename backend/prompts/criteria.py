@@ -1,14 +1,35 @@
-def get_criteria_prompt(item: str) -> str:
-    """
-    Generate the prompt for authentication criteria with detailed location info and backups.
-    
-    Args:
-        item: The name/type of item to check
-        
-    Returns:
-        str: The formatted prompt
-    """
-    return f"""
+from functools import lru_cache
+
+from prompts import RETURN_JSON_ONLY, clean_prompt, count_tokens, dump_example, escape_braces, load_resource
+
+# Few-shot example of the expected response, serialized compactly into the prompt
+CRITERIA_EXAMPLE = {
+    "criteria": [
+        {
+            "primary_feature": "Brown vachetta leather trim with natural tan color that darkens to honey patina, untreated and oxidizes over time",
+            "primary_location": "Top handles and side straps",
+            "why_important": "Authentic vachetta leather oxidizes naturally from light tan to rich honey brown - counterfeit leather often uses dye or coating that doesn't age naturally",
+            "how_to_photograph": "Close-up shot (6-12 inches away) of handle in natural daylight, showing the gradient of color if aged, or the pale tan if new",
+            "backup_feature": "Leather pull tabs on zipper with same vachetta leather characteristics",
+            "backup_location": "Main zipper at top of bag",
+            "backup_how_to_photograph": "Macro shot of zipper pull tab showing leather grain and color, natural lighting from side angle"
+        },
+        {
+            "primary_feature": "Beige and brown monogram canvas with LV logo pattern, letters should be symmetrical and evenly spaced with brown 'LV' on beige background",
+            "primary_location": "Front center panel of bag",
+            "why_important": "The monogram pattern should align perfectly at seams - authentic bags are cut from a single piece of canvas with pattern alignment, counterfeits often have misaligned patterns",
+            "how_to_photograph": "Straight-on front view, 12-18 inches away, showing full monogram pattern and how it aligns at edges/seams",
+            "backup_feature": "Monogram pattern on the back panel, checking for same alignment and symmetry",
+            "backup_location": "Rear panel of bag",
+            "backup_how_to_photograph": "Straight-on rear view at same distance, showing pattern continuity and seam alignment"
+        }
+    ]
+}
+
+CRITERIA_EXAMPLE_JSON = dump_example(CRITERIA_EXAMPLE)
+
+# Filled with str.format - braces in the inlined example are doubled so format leaves them alone
+CRITERIA_PROMPT = clean_prompt("""
     
 # Goal    
 You are an expert in authenticating luxury goods and identifying counterfeits.
@@ -33,41 +54,12 @@ CRITICAL REQUIREMENTS:
 # Format
 Format your response as a JSON object:
 ```json
-{{
-  "criteria": [
-    {{
-      "primary_feature": "Brown vachetta leather trim with natural tan color that darkens to honey patina, untreated and oxidizes over time",
-      "primary_location": "Top handles and side straps",
-      "why_important": "Authentic vachetta leather oxidizes naturally from light tan to rich honey brown - counterfeit leather often uses dye or coating that doesn't age naturally",
-      "how_to_photograph": "Close-up shot (6-12 inches away) of handle in natural daylight, showing the gradient of color if aged, or the pale tan if new",
-      "backup_feature": "Leather pull tabs on zipper with same vachetta leather characteristics",
-      "backup_location": "Main zipper at top of bag",
-      "backup_how_to_photograph": "Macro shot of zipper pull tab showing leather grain and color, natural lighting from side angle"
-    }},
-    {{
-      "primary_feature": "Beige and brown monogram canvas with LV logo pattern, letters should be symmetrical and evenly spaced with brown 'LV' on beige background",
-      "primary_location": "Front center panel of bag",
-      "why_important": "The monogram pattern should align perfectly at seams - authentic bags are cut from a single piece of canvas with pattern alignment, counterfeits often have misaligned patterns",
-      "how_to_photograph": "Straight-on front view, 12-18 inches away, showing full monogram pattern and how it aligns at edges/seams",
-      "backup_feature": "Monogram pattern on the back panel, checking for same alignment and symmetry",
-      "backup_location": "Rear panel of bag",
-      "backup_how_to_photograph": "Straight-on rear view at same distance, showing pattern continuity and seam alignment"
-    }}
-  ]
-}}
+__CRITERIA_EXAMPLE__
 ```
 
 # Examples:
 
-**Good detailed criterion**:
-- Primary Feature: "Baby blue grained calfskin leather with soft pebbled texture, approximately 2-3mm grain size, matte finish"
-- Location & Why: "Entire exterior surface - this specific leather type and grain size is proprietary to the brand's tannery"
-- How to Photograph: "Multiple angles in natural light: front straight-on, side at 45°, close-up macro of grain texture"
-
-**Bad generic criterion** ❌:
-- "Fine-grained, supple leather trim"
-- "On the bag"
-- "Take a photo"
+__CRITERIA_GOOD_BAD_EXAMPLES__
 
 # Requirements:
 - ALWAYS explain WHERE and WHY for each location
@@ -79,5 +71,30 @@ Format your response as a JSON object:
 - Research the EXACT item and its authentic characteristics
 - Backup features should be equally distinctive and verifiable
 
-Return ONLY valid JSON in the exact format shown above.
-"""
+""" + RETURN_JSON_ONLY).replace(
+    "__CRITERIA_EXAMPLE__", escape_braces(CRITERIA_EXAMPLE_JSON)
+).replace(
+    "__CRITERIA_GOOD_BAD_EXAMPLES__", escape_braces(load_resource("criteria_examples.md"))
+)
+
+# Tokens of the template itself, counted once; only the item name varies per request
+CRITERIA_STATIC_TOKENS = count_tokens(CRITERIA_PROMPT.format(item=""))
+
+
+def count_criteria_tokens(item: str) -> int:
+    """Estimated token count of get_criteria_prompt(item) without rendering it."""
+    return CRITERIA_STATIC_TOKENS + count_tokens(item)
+
+
+@lru_cache(maxsize=512)
+def get_criteria_prompt(item: str) -> str:
+    """
+    Generate the prompt for authentication criteria with detailed location info and backups.
+    
+    Args:
+        item: The name/type of item to check
+        
+    Returns:
+        str: The formatted prompt
+    """
+    return CRITERIA_PROMPT.format(item=item)
@@ -1,11 +1,7 @@
-def get_fact_check_prompt() -> str:
-    """
-    Generate the prompt for fact-checking content in images.
-    
-    Returns:
-        str: The formatted prompt for fact-checking
-    """
-    return """
+from prompts import RETURN_JSON_ONLY, clean_prompt, load_resource
+
+# No variables - returned as-is
+FACT_CHECK_PROMPT = clean_prompt("""
 # Goal
 You are an expert fact-checker with access to current information on the internet. Your job is to analyze the content in the provided image and verify its accuracy.
 
@@ -66,16 +62,7 @@ Return your analysis as a JSON object:
 
 # Examples of Good Fact-Checking:
 
-**Claim in Tweet**: "The Eiffel Tower was completed in 1889"
-- Verdict: TRUE
-- Evidence: "Multiple historical sources confirm the Eiffel Tower was completed on March 31, 1889, for the 1889 World's Fair in Paris."
-- Sources: Encyclopedia Britannica, official Eiffel Tower website
-- Context: "Built as the entrance arch for the World's Fair, it was initially criticized but became an iconic symbol."
-
-**Claim in Infographic**: "90% of ocean plastic comes from 10 rivers"
-- Verdict: PARTIALLY TRUE
-- Evidence: "A 2017 study found that 10 rivers contribute significant plastic waste, but the '90%' figure has been disputed by more recent research showing a more complex picture."
-- Context: "While major rivers in Asia and Africa do contribute heavily to ocean plastic, the exact percentage is debated and other sources also contribute."
+__FACT_CHECK_EXAMPLES__
 
 # Requirements:
 - Extract ALL factual claims from the image
@@ -86,6 +73,15 @@ Return your analysis as a JSON object:
 - If no factual claims are present (pure opinion/art), indicate this clearly
 - Consider the date context - claims may have been true at time of posting but not now
 
-Return ONLY valid JSON in the exact format shown above.
-"""
+""" + RETURN_JSON_ONLY).replace("__FACT_CHECK_EXAMPLES__", load_resource("fact_check_examples.md"))
+
+
+def get_fact_check_prompt() -> str:
+    """
+    Generate the prompt for fact-checking content in images.
+    
+    Returns:
+        str: The formatted prompt for fact-checking
+    """
+    return FACT_CHECK_PROMPT
 
@@ -1,15 +1,8 @@
-def get_image_analysis_prompt(allow_repositioning: bool = True) -> str:
-    """
-    Generate the prompt for analyzing what's in an image.
-    
-    Args:
-        allow_repositioning: Whether to allow repositioning suggestions
-        
-    Returns:
-        str: The formatted prompt
-    """
-    if allow_repositioning:
-        return """Analyze this image and identify what it contains. Return ONLY valid JSON.
+from functools import lru_cache
+
+from prompts import clean_prompt
+
+IMAGE_ANALYSIS_PROMPT_WITH_REPOSITIONING = clean_prompt("""Analyze this image and identify what it contains.
 
 Determine the PRIMARY content type:
 - "person": If the image primarily shows a human/person
@@ -32,9 +25,9 @@ Examples:
 - Product: {"type": "product", "name": "Coca-Cola Classic 12oz can", "confidence": "High", ...}
 - Text: {"type": "text", "name": "Business document", "confidence": "Medium", ...}
 
-If unclear, set needs_repositioning: true with specific instructions."""
-    else:
-        return """Analyze this image and identify what it contains. Return ONLY valid JSON.
+If unclear, set needs_repositioning: true with specific instructions.""")
+
+IMAGE_ANALYSIS_PROMPT = clean_prompt("""Analyze this image and identify what it contains.
 
 Determine the PRIMARY content type:
 - "person": If the image primarily shows a human/person
@@ -50,20 +43,32 @@ Return format:
   "description": "Brief description of what you see"
 }
 
-Do your best to identify from the image provided."""
+Do your best to identify from the image provided.""")
 
+# Response schema for analyze_image, enforced by Gemini structured output
+IMAGE_ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "type": {"type": "STRING", "enum": ["person", "product", "text", "other"]},
+        "name": {"type": "STRING"},
+        "confidence": {"type": "STRING", "enum": ["High", "Medium", "Low"]},
+        "description": {"type": "STRING"},
+    },
+    "required": ["type", "name", "confidence", "description"],
+}
 
-def get_price_search_prompt(product_name: str) -> str:
-    """
-    Generate the prompt for searching product price.
-    
-    Args:
-        product_name: Full name of the product to search for
-        
-    Returns:
-        str: The formatted prompt
-    """
-    return f"""Search the web for current pricing information for: {product_name}
+IMAGE_ANALYSIS_SCHEMA_WITH_REPOSITIONING = {
+    "type": "OBJECT",
+    "properties": {
+        **IMAGE_ANALYSIS_SCHEMA["properties"],
+        "needs_repositioning": {"type": "BOOLEAN"},
+        "repositioning_instructions": {"type": "STRING", "nullable": True},
+    },
+    "required": IMAGE_ANALYSIS_SCHEMA["required"] + ["needs_repositioning"],
+}
+
+# Filled with str.format - literal braces in the JSON example are doubled
+PRICE_SEARCH_PROMPT = clean_prompt("""Search the web for current pricing information for: {product_name}
 
 
 Find the most recent pricing from reputable online retailers (Amazon, official brand stores, major retailers, etc.).
@@ -85,5 +90,45 @@ Example response:
 }}
 ```
 
-Provide accurate, up-to-date USD pricing. Return only the JSON, no other text."""
+Provide accurate, up-to-date USD pricing. Return only the JSON, no other text.""")
+
+
+def get_image_analysis_prompt(allow_repositioning: bool = True) -> str:
+    """
+    Generate the prompt for analyzing what's in an image.
+    
+    Args:
+        allow_repositioning: Whether to allow repositioning suggestions
+        
+    Returns:
+        str: The formatted prompt
+    """
+    return IMAGE_ANALYSIS_PROMPT_WITH_REPOSITIONING if allow_repositioning else IMAGE_ANALYSIS_PROMPT
+
+
+def get_image_analysis_schema(allow_repositioning: bool = True) -> dict:
+    """
+    Response schema matching get_image_analysis_prompt(allow_repositioning).
+    
+    Args:
+        allow_repositioning: Whether the response includes repositioning fields
+        
+    Returns:
+        dict: Gemini response_schema
+    """
+    return IMAGE_ANALYSIS_SCHEMA_WITH_REPOSITIONING if allow_repositioning else IMAGE_ANALYSIS_SCHEMA
+
+
+@lru_cache(maxsize=512)
+def get_price_search_prompt(product_name: str) -> str:
+    """
+    Generate the prompt for searching product price.
+    
+    Args:
+        product_name: Full name of the product to search for
+        
+    Returns:
+        str: The formatted prompt
+    """
+    return PRICE_SEARCH_PROMPT.format(product_name=product_name)
 
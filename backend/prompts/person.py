@@ -1,16 +1,9 @@
-def get_person_fakeness_prompt(name: str) -> str:
-    """
-    Generate the prompt for researching a person's fakeness.
-    
-    Args:
-        name: The person's name to research
-        
-    Returns:
-        str: The formatted prompt
-    """
-    return f"""
+from prompts import clean_prompt
+
+# The name is substituted with a single str.replace pass (no format parsing of the JSON braces)
+PERSON_FAKENESS_PROMPT = clean_prompt("""
 # Goal
-Research the person "{name}" using web search to find REAL, VERIFIABLE information about their reputation, achievements, and any controversies.
+Research the person "__PERSON_NAME__" using web search to find REAL, VERIFIABLE information about their reputation, achievements, and any controversies.
 
 # CRITICAL RULES
 1. **ONLY use REAL sources that actually exist on the web**
@@ -43,12 +36,12 @@ POSITIVE:
 # Format
 Return ONLY this JSON structure:
 ```json
-{{
-    "person_name": "{name}",
+{
+    "person_name": "__PERSON_NAME__",
     "overall_assessment": "clean" / "minor_issues" / "moderate_concerns" / "serious_concerns",
     "fakeness_score": 0-100,
     "findings": [
-        {{
+        {
             "type": "positive" / "negative",
             "category": "achievement" / "award" / "contribution" / "criminal_record" / "controversy" / "misconduct",
             "title": "Brief title",
@@ -56,26 +49,26 @@ Return ONLY this JSON structure:
             "description": "What happened",
             "severity": "low" / "medium" / "high" (for negative only),
             "source": "ACTUAL URL YOU FOUND (https://...)"
-        }}
+        }
     ],
-    "statistics": {{
+    "statistics": {
         "total_findings": number,
         "positive_findings": number,
         "negative_findings": number,
         "verified_incidents": number,
         "date_range": "YYYY-YYYY",
         "media_mentions": number,
-        "severity_breakdown": {{"high": 0, "medium": 0, "low": 0}}
-    }},
-    "search_metadata": {{
+        "severity_breakdown": {"high": 0, "medium": 0, "low": 0}
+    },
+    "search_metadata": {
         "searches_performed": number,
         "sources_analyzed": number,
         "last_updated": "current timestamp"
-    }},
+    },
     "summary": "Brief factual summary",
     "red_flags": ["Major concerns if any"],
     "positive_notes": ["Positive context if relevant"]
-}}
+}
 ```
 
 **REMEMBER**: 
@@ -84,5 +77,18 @@ Return ONLY this JSON structure:
 - Only REAL sources from actual web searches
 - Say "No credible sources found" if you can't verify information
 - Fakeness score should be based on negative findings only (0 = clean, 100 = very problematic)
-"""
+""")
+
+
+def get_person_fakeness_prompt(name: str) -> str:
+    """
+    Generate the prompt for researching a person's fakeness.
+    
+    Args:
+        name: The person's name to research
+        
+    Returns:
+        str: The formatted prompt
+    """
+    return PERSON_FAKENESS_PROMPT.replace("__PERSON_NAME__", name)
 
@@ -1,14 +1,9 @@
-def get_product_name_extraction_prompt(product_name: str) -> str:
-    """
-    Generate the prompt for extracting clean product names.
-    
-    Args:
-        product_name: Raw product name string (often from URLs or titles)
-        
-    Returns:
-        str: The formatted prompt
-    """
-    return f"""Extract ONLY the core product name from this text. Remove:
+from functools import lru_cache
+
+from prompts import clean_prompt
+
+# Filled with str.format
+PRODUCT_NAME_EXTRACTION_PROMPT = clean_prompt("""Extract ONLY the core product name from this text. Remove:
 - Platform names (eBay, Amazon, etc.)
 - Edition markers (ENCORE EDITION, Limited Edition, etc.)
 - Condition markers (NIP, BNIB, Used, New, etc.)
@@ -25,4 +20,18 @@ Examples:
 "Apple iPhone 15 Pro Max - 256GB - NEW - Factory Unlocked | Amazon" -> "Apple iPhone 15 Pro Max 256GB"
 "Louis Vuitton Wallet | Authentic LV | eBay" -> "Louis Vuitton Wallet"
 
-Now extract from the input above:"""
+Now extract from the input above:""")
+
+
+@lru_cache(maxsize=512)
+def get_product_name_extraction_prompt(product_name: str) -> str:
+    """
+    Generate the prompt for extracting clean product names.
+    
+    Args:
+        product_name: Raw product name string (often from URLs or titles)
+        
+    Returns:
+        str: The formatted prompt
+    """
+    return PRODUCT_NAME_EXTRACTION_PROMPT.format(product_name=product_name)
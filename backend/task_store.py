@@ -0,0 +1,115 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+try:
+    # Several times faster than the stdlib for the nested task payloads
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# Default database for detection tasks, next to criteria_cache.db
+TASKS_DB = "detect_tasks.db"
+TASK_TTL_SECONDS = 86400
+
+
+class TaskStore:
+    """
+    Detection task storage shared across worker processes.
+
+    Tasks are stored as JSON in SQLite running in WAL mode, so several
+    gunicorn workers can read and update them concurrently. Exposes the
+    subset of the dict interface main.py uses, plus update() for partial
+    writes.
+    """
+
+    def __init__(self, db_path: str = TASKS_DB, ttl: Optional[float] = TASK_TTL_SECONDS):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            ttl: Seconds a task stays readable after its last write (None = forever)
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS detect_tasks (
+                detection_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections can't be shared across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _min_updated_at(self) -> float:
+        return time.time() - self.ttl if self.ttl is not None else 0.0
+
+    def get(self, detection_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        """Return the task dict for detection_id, or default if missing/expired."""
+        row = self._connect().execute(
+            'SELECT payload FROM detect_tasks WHERE detection_id = ? AND updated_at >= ?',
+            (detection_id, self._min_updated_at())
+        ).fetchone()
+        return _loads(row[0]) if row else default
+
+    def __getitem__(self, detection_id: str) -> Dict[str, Any]:
+        task = self.get(detection_id)
+        if task is None:
+            raise KeyError(detection_id)
+        return task
+
+    def __contains__(self, detection_id: str) -> bool:
+        return self.get(detection_id) is not None
+
+    def __setitem__(self, detection_id: str, task: Dict[str, Any]) -> None:
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO detect_tasks (detection_id, payload, updated_at) VALUES (?, ?, ?)',
+            (detection_id, _dumps(task), time.time())
+        )
+        # Drop expired tasks so the table doesn't grow forever
+        conn.execute('DELETE FROM detect_tasks WHERE updated_at < ?', (self._min_updated_at(),))
+
+    def update(self, detection_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Atomically merge fields into an existing task.
+
+        Returns:
+            The updated task dict
+
+        Raises:
+            KeyError: If the task does not exist
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            task = self[detection_id]
+            task.update(fields)
+            conn.execute(
+                'UPDATE detect_tasks SET payload = ?, updated_at = ? WHERE detection_id = ?',
+                (_dumps(task), time.time(), detection_id)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return task
@@ -6,9 +6,30 @@ Uses Google Lens to find exact matches and visual matches for product authentica
 
 import os
 import sys
+import numpy as np
 sys.path.append('..')
 from generate_real_images import ReverseImageSearcher
 
+def bucket_results(results):
+    """
+    Split results by match type and trust level in one pass over the list.
+    
+    Returns:
+        Dict of result lists: exact, visual, high (>=0.8), medium (0.5-0.8), low (<0.5)
+    """
+    n = len(results)
+    scores = np.fromiter((r['trust_score'] for r in results), dtype=np.float32, count=n)
+    exact = np.fromiter((bool(r.get('is_exact_match')) for r in results), dtype=bool, count=n)
+    
+    masks = {
+        'exact': exact,
+        'visual': ~exact,
+        'high': scores >= 0.8,
+        'medium': (scores >= 0.5) & (scores < 0.8),
+        'low': scores < 0.5,
+    }
+    return {name: [results[i] for i in np.flatnonzero(mask)] for name, mask in masks.items()}
+
 def test_exact_matching():
     """Test Google Lens API for product matching and counterfeit detection"""
     
@@ -34,86 +55,92 @@ def test_exact_matching():
         
         # Search using Google Lens API
         results = searcher.search_by_image_url(test_url, max_results=15)
+        report = []
+        out = report.append
         
         if results:
-            print(f"\n✅ Found {len(results)} results from Google Lens!")
+            out(f"\n✅ Found {len(results)} results from Google Lens!")
             
-            # Separate exact matches from visual matches
-            exact_matches = [r for r in results if r.get('is_exact_match')]
-            visual_matches = [r for r in results if not r.get('is_exact_match')]
+            # Separate exact matches from visual matches, and bucket by trust score
+            buckets = bucket_results(results)
+            exact_matches = buckets['exact']
+            visual_matches = buckets['visual']
             
             # Show section breakdown
-            print(f"\n📊 RESULTS BREAKDOWN:")
-            print("="*60)
-            print(f"   🎯 Exact matches: {len(exact_matches)}")
-            print(f"   👀 Visual matches: {len(visual_matches)}")
+            out(f"\n📊 RESULTS BREAKDOWN:")
+            out("="*60)
+            out(f"   🎯 Exact matches: {len(exact_matches)}")
+            out(f"   👀 Visual matches: {len(visual_matches)}")
             
             # Analyze trust scores
-            high_trust = [r for r in results if r['trust_score'] >= 0.8]
-            medium_trust = [r for r in results if 0.5 <= r['trust_score'] < 0.8]
-            low_trust = [r for r in results if r['trust_score'] < 0.5]
+            high_trust = buckets['high']
+            medium_trust = buckets['medium']
+            low_trust = buckets['low']
             
-            print(f"\n🛡️  TRUST SCORE ANALYSIS:")
-            print("="*60)
-            print(f"   ✅ High trust (≥0.8): {len(high_trust)} results")
-            print(f"   ⚠️  Medium trust (0.5-0.8): {len(medium_trust)} results")
-            print(f"   ❌ Low trust (<0.5): {len(low_trust)} results")
+            out(f"\n🛡️  TRUST SCORE ANALYSIS:")
+            out("="*60)
+            out(f"   ✅ High trust (≥0.8): {len(high_trust)} results")
+            out(f"   ⚠️  Medium trust (0.5-0.8): {len(medium_trust)} results")
+            out(f"   ❌ Low trust (<0.5): {len(low_trust)} results")
             
             # Show top results
-            print(f"\n🏆 TOP RESULTS:")
-            print("="*80)
+            out(f"\n🏆 TOP RESULTS:")
+            out("="*80)
             
             for i, result in enumerate(results[:5], 1):
                 match_type = "🎯 EXACT MATCH" if result.get('is_exact_match') else "👀 VISUAL MATCH"
                 trust_indicator = "✅" if result['trust_score'] >= 0.8 else "⚠️" if result['trust_score'] >= 0.5 else "❌"
                 
-                print(f"\n{i}. {match_type}")
-                print(f"   Title: {result['title']}")
-                print(f"   {trust_indicator} Source: {result['source']} (Trust: {result['trust_score']:.2f})")
-                print(f"   🔗 Link: {result['link']}")
-                print(f"   🖼️  bbnail: {result.get('thumbnail', 'Not available')}")
+                out(f"\n{i}. {match_type}")
+                out(f"   Title: {result['title']}")
+                out(f"   {trust_indicator} Source: {result['source']} (Trust: {result['trust_score']:.2f})")
+                out(f"   🔗 Link: {result['link']}")
+                out(f"   🖼️  bbnail: {result.get('thumbnail', 'Not available')}")
                 
                 if result.get('price'):
-                    print(f"   💰 Price: {result['price']}")
+                    out(f"   💰 Price: {result['price']}")
                 if result.get('rating'):
-                    print(f"   ⭐ Rating: {result['rating']}")
+                    out(f"   ⭐ Rating: {result['rating']}")
                 if result.get('image_resolution'):
-                    print(f"   📐 Resolution: {result['image_resolution']}")
+                    out(f"   📐 Resolution: {result['image_resolution']}")
             
             # Counterfeit detection insights
-            print(f"\n🛡️  COUNTERFEIT DETECTION INSIGHTS:")
-            print("="*60)
+            out(f"\n🛡️  COUNTERFEIT DETECTION INSIGHTS:")
+            out("="*60)
             
             if high_trust:
-                print(f"\n✅ {len(high_trust)} HIGH-TRUST SOURCES FOUND:")
-                print("   💡 These are verified authentic sources")
+                out(f"\n✅ {len(high_trust)} HIGH-TRUST SOURCES FOUND:")
+                out("   💡 These are verified authentic sources")
                 for r in high_trust[:3]:
-                    print(f"   • {r['source']} - {r['title'][:50]}")
-                    print(f"     Link: {r['link']}")
-                    print(f"     Thumbnail: {r.get('thumbnail', 'Not available')}")
+                    out(f"   • {r['source']} - {r['title'][:50]}")
+                    out(f"     Link: {r['link']}")
+                    out(f"     Thumbnail: {r.get('thumbnail', 'Not available')}")
             
             if exact_matches:
-                print(f"\n🎯 {len(exact_matches)} EXACT MATCHES FOUND:")
-                print("   💡 These are the exact same product")
-                print("   ✅ Use these as reference for authentication")
+                out(f"\n🎯 {len(exact_matches)} EXACT MATCHES FOUND:")
+                out("   💡 These are the exact same product")
+                out("   ✅ Use these as reference for authentication")
                 for r in exact_matches[:3]:
-                    print(f"   • {r['title'][:60]}")
+                    out(f"   • {r['title'][:60]}")
             
             if not high_trust and not exact_matches:
-                print("\n⚠️  WARNING: No high-trust sources or exact matches found")
-                print("   🚨 Higher risk of counterfeit")
-                print("   💡 Recommendations:")
-                print("   • Verify with official brand website")
-                print("   • Check for authentication certificates")
-                print("   • Compare physical details carefully")
+                out("\n⚠️  WARNING: No high-trust sources or exact matches found")
+                out("   🚨 Higher risk of counterfeit")
+                out("   💡 Recommendations:")
+                out("   • Verify with official brand website")
+                out("   • Check for authentication certificates")
+                out("   • Compare physical details carefully")
             
         else:
-            print("\n❌ No results found.")
-            print("💡 This could indicate:")
-            print("   • Very rare/unique item")
-            print("   • Poor image quality")
-            print("   • Item not widely available online")
-            print("   • Potential counterfeit")
+            out("\n❌ No results found.")
+            out("💡 This could indicate:")
+            out("   • Very rare/unique item")
+            out("   • Poor image quality")
+            out("   • Item not widely available online")
+            out("   • Potential counterfeit")
+        
+        # One write for the whole report instead of a print per line
+        print("\n".join(report))
             
     except Exception as e:
         print(f"❌ Error during testing: {e}")
@@ -155,66 +182,72 @@ def test_custom_exact_matching():
         print("⏳ This may take a few seconds...")
         
         results = searcher.search_by_image_url(image_url, max_results=15)
+        report = []
+        out = report.append
         
         if results:
-            print(f"\n✅ Found {len(results)} results from Google Lens!")
+            out(f"\n✅ Found {len(results)} results from Google Lens!")
             
             # Separate by match type
-            exact_matches = [r for r in results if r.get('is_exact_match')]
-            visual_matches = [r for r in results if not r.get('is_exact_match')]
+            buckets = bucket_results(results)
+            exact_matches = buckets['exact']
+            visual_matches = buckets['visual']
             
             # Trust analysis
-            high_trust = [r for r in results if r['trust_score'] >= 0.8]
+            high_trust = buckets['high']
             
-            print(f"\n📊 QUICK SUMMARY:")
-            print("="*60)
-            print(f"   🎯 Exact matches: {len(exact_matches)}")
-            print(f"   👀 Visual matches: {len(visual_matches)}")
-            print(f"   ✅ High-trust sources: {len(high_trust)}")
+            out(f"\n📊 QUICK SUMMARY:")
+            out("="*60)
+            out(f"   🎯 Exact matches: {len(exact_matches)}")
+            out(f"   👀 Visual matches: {len(visual_matches)}")
+            out(f"   ✅ High-trust sources: {len(high_trust)}")
             
             # Show top 5 results
-            print(f"\n🏆 TOP 5 RESULTS:")
-            print("="*80)
+            out(f"\n🏆 TOP 5 RESULTS:")
+            out("="*80)
             
             for i, result in enumerate(results[:5], 1):
                 match_type = "🎯 EXACT" if result.get('is_exact_match') else "👀 VISUAL"
                 trust_emoji = "✅" if result['trust_score'] >= 0.8 else "⚠️" if result['trust_score'] >= 0.5 else "❌"
                 
-                print(f"\n{i}. [{match_type}] {result['title'][:60]}")
-                print(f"   {trust_emoji} {result['source']} (Trust: {result['trust_score']:.2f})")
-                print(f"   🔗 {result['link']}")
-                print(f"   🖼️  Thumbnail: {result.get('thumbnail', 'Not available')}")
+                out(f"\n{i}. [{match_type}] {result['title'][:60]}")
+                out(f"   {trust_emoji} {result['source']} (Trust: {result['trust_score']:.2f})")
+                out(f"   🔗 {result['link']}")
+                out(f"   🖼️  Thumbnail: {result.get('thumbnail', 'Not available')}")
                 
                 if result.get('price'):
-                    print(f"   💰 {result['price']}")
+                    out(f"   💰 {result['price']}")
             
             # Authentication verdict
-            print(f"\n🛡️  AUTHENTICATION VERDICT:")
-            print("="*60)
+            out(f"\n🛡️  AUTHENTICATION VERDICT:")
+            out("="*60)
             
             if high_trust and (exact_matches or len(visual_matches) >= 3):
-                print("✅ LIKELY AUTHENTIC")
-                print(f"   • Found {len(high_trust)} high-trust sources")
+                out("✅ LIKELY AUTHENTIC")
+                out(f"   • Found {len(high_trust)} high-trust sources")
                 if exact_matches:
-                    print(f"   • Found {len(exact_matches)} exact matches")
-                print("   • Product matches known authentic listings")
+                    out(f"   • Found {len(exact_matches)} exact matches")
+                out("   • Product matches known authentic listings")
             elif high_trust or visual_matches:
-                print("⚠️  NEEDS VERIFICATION")
-                print("   • Some matches found, but limited high-trust sources")
-                print("   • Compare physical details carefully")
-                print("   • Check authentication certificates")
+                out("⚠️  NEEDS VERIFICATION")
+                out("   • Some matches found, but limited high-trust sources")
+                out("   • Compare physical details carefully")
+                out("   • Check authentication certificates")
             else:
-                print("🚨 SUSPICIOUS - HIGH RISK")
-                print("   • No high-trust sources found")
-                print("   • Limited or no matches")
-                print("   • Recommend professional authentication")
+                out("🚨 SUSPICIOUS - HIGH RISK")
+                out("   • No high-trust sources found")
+                out("   • Limited or no matches")
+                out("   • Recommend professional authentication")
             
         else:
-            print("\n❌ No results found from Google Lens")
-            print("⚠️  This is suspicious and could indicate:")
-            print("   • Counterfeit item not available online")
-            print("   • Very rare/unique item")
-            print("   • Poor image quality affecting search")
+            out("\n❌ No results found from Google Lens")
+            out("⚠️  This is suspicious and could indicate:")
+            out("   • Counterfeit item not available online")
+            out("   • Very rare/unique item")
+            out("   • Poor image quality affecting search")
+        
+        # One write for the whole report instead of a print per line
+        print("\n".join(report))
             
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -5,65 +5,77 @@ Clean test script for comparing images from URLs
 
 import os
 import sys
+import io
 import requests
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
+import numpy as np
+from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 sys.path.append('..')
 
-from image_similarity_scores import ImageSimilarityCalculator, ComparisonAnalyzer, SimilarityConfig
+# One pooled session for all downloads so repeat hosts skip the TCP/TLS handshake
+_SESSION = requests.Session()
+_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.3))
+_SESSION.mount('https://', _adapter)
+_SESSION.mount('http://', _adapter)
 
-def download_image_from_url(url: str, temp_dir: str) -> str:
-    """Download an image from URL and save it to a temporary file."""
+# Downloads larger than this are aborted instead of being read into memory
+MAX_IMAGE_BYTES = 25 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Formats cv2.imdecode reads natively; anything else (GIF, unknown) goes through PIL
+CV2_IMAGE_TYPES = {'.jpg', '.png', '.webp'}
+
+def _sniff_image_type(data: bytes) -> str:
+    """Image extension from the file's magic bytes, or '' if not recognized."""
+    if data[:3] == b'\xff\xd8\xff':
+        return '.jpg'
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return '.png'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return '.webp'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return '.gif'
+    return ''
+
+def download_image_from_url(url: str) -> Optional[np.ndarray]:
+    """Download an image from URL and decode it in memory to a BGR array."""
     try:
         # Validate URL
         parsed_url = urlparse(url)
         if not parsed_url.scheme or not parsed_url.netloc:
             raise ValueError("Invalid URL format")
         
-        # Download the image
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        # Stream the image in chunks, giving up on oversized or non-image responses early
+        data = bytearray()
+        with _SESSION.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            if int(response.headers.get('content-length') or 0) > MAX_IMAGE_BYTES:
+                raise ValueError("Image too large")
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                if not data and not _sniff_image_type(chunk) and \
+                        response.headers.get('content-type', '').startswith('text/'):
+                    raise ValueError("URL did not return an image")
+                data.extend(chunk)
+                if len(data) > MAX_IMAGE_BYTES:
+                    raise ValueError("Image too large")
         
-        # Determine file extension
-        content_type = response.headers.get('content-type', '')
-        if 'jpeg' in content_type or 'jpg' in content_type:
-            ext = '.jpg'
-        elif 'png' in content_type:
-            ext = '.png'
-        elif 'webp' in content_type:
-            ext = '.webp'
-        else:
-            ext = '.jpg'
-        
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=ext, dir=temp_dir, mode='wb')
-        temp_file.write(response.content)
-        temp_file.close()
-        
-        # Verify the image can be loaded by OpenCV
-        import cv2
-        test_img = cv2.imread(temp_file.name)
-        if test_img is None:
-            # Try to convert using PIL
+        # Decode straight from the downloaded bytes - no temp file round trip. The
+        # magic bytes pick the decoder, whatever Content-Type the server claims
+        img = None
+        if _sniff_image_type(data) in CV2_IMAGE_TYPES:
+            import cv2
+            img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            # Formats OpenCV can't decode (e.g. GIF, or a WebP without codec support): go through PIL, RGB -> BGR
             from PIL import Image
-            try:
-                pil_img = Image.open(temp_file.name)
-                if pil_img.mode != 'RGB':
-                    pil_img = pil_img.convert('RGB')
-                jpeg_path = temp_file.name.replace(ext, '.jpg')
-                pil_img.save(jpeg_path, 'JPEG')
-                test_img = cv2.imread(jpeg_path)
-                if test_img is not None:
-                    return jpeg_path
-            except:
-                pass
-            return None
+            pil_img = Image.open(io.BytesIO(data)).convert('RGB')
+            img = np.ascontiguousarray(np.asarray(pil_img)[:, :, ::-1])
         
-        return temp_file.name
+        return img
         
     except Exception as e:
         return None
@@ -83,37 +95,36 @@ def test_url_images():
         print("❌ Both image URLs are required")
         return
     
-    # Create temporary directory for downloaded images
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Download images
-        image1_path = download_image_from_url(url1, temp_dir)
-        image2_path = download_image_from_url(url2, temp_dir)
-        
-        if not image1_path or not image2_path:
-            print("❌ Failed to download images")
-            return
-        
-        # Test comprehensive analysis
-        analyzer = ComparisonAnalyzer()
-        result = analyzer.compare_images(image1_path, image2_path, threshold=0.6)
-        
-        if "error" in result:
-            print(f"❌ Error: {result['error']}")
-            return
-        
-        # Display results
-        print(f"\n📊 Results:")
-        print(f"Similarity Score: {result['similarity_score']}")
-        print(f"Match Status: {result['match_status']}")
-        print(f"Confidence: {result['analysis']['confidence']}")
-        print(f"Recommendation: {result['analysis']['recommendation']}")
-        
-        # Get counterfeit detection insights
-        counterfeit_insights = analyzer.get_counterfeit_detection_insights(result)
-        if "error" not in counterfeit_insights:
-            print(f"\n🛡️  Counterfeit Detection:")
-            print(f"Verdict: {counterfeit_insights['verdict']}")
-            print(f"Confidence: {counterfeit_insights['confidence']}")
+    # Download both images concurrently - each is bound by network latency
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        image1, image2 = executor.map(download_image_from_url, [url1, url2])
+    
+    if image1 is None or image2 is None:
+        print("❌ Failed to download images")
+        return
+    
+    # Test comprehensive analysis (imported here - OpenCV/scikit-image are slow to load)
+    from image_similarity_scores import ComparisonAnalyzer
+    analyzer = ComparisonAnalyzer()
+    result = analyzer.compare_images(image1, image2, threshold=0.6)
+    
+    if "error" in result:
+        print(f"❌ Error: {result['error']}")
+        return
+    
+    # Display results
+    print(f"\n📊 Results:")
+    print(f"Similarity Score: {result['similarity_score']}")
+    print(f"Match Status: {result['match_status']}")
+    print(f"Confidence: {result['analysis']['confidence']}")
+    print(f"Recommendation: {result['analysis']['recommendation']}")
+    
+    # Get counterfeit detection insights
+    counterfeit_insights = analyzer.get_counterfeit_detection_insights(result)
+    if "error" not in counterfeit_insights:
+        print(f"\n🛡️  Counterfeit Detection:")
+        print(f"Verdict: {counterfeit_insights['verdict']}")
+        print(f"Confidence: {counterfeit_insights['confidence']}")
 
 def test_custom_config():
     """Test with custom configuration."""
@@ -122,6 +133,7 @@ def test_custom_config():
     print("="*50)
     
     # Create custom configuration
+    from image_similarity_scores import ComparisonAnalyzer, SimilarityConfig
     custom_config = SimilarityConfig(
         COLOR_WEIGHT=0.2,
         SIFT_WEIGHT=0.5,
@@ -1,10 +1,16 @@
+import io
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from supabase import create_client, Client
-import uuid
-import mimetypes
+from PIL import Image, ImageOps
+import hashlib
+import sqlite3
+import threading
+import time
+from cache_utils import TTLCache
 
 # Load environment variables
 load_dotenv()
@@ -19,19 +25,191 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Image extensions we upload -> content type (a static table instead of mimetypes'
+# lazily loaded system database)
+IMAGE_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif',
+    '.bmp': 'image/bmp',
+    '.tif': 'image/tiff',
+    '.tiff': 'image/tiff',
+    '.heic': 'image/heic',
+    '.avif': 'image/avif',
+}
+
+# Images above this size are downscaled and re-encoded before upload; phone photos
+# are several MB, and the vision models don't need more than ~2K pixels per edge
+SHRINK_THRESHOLD_BYTES = 512 * 1024
+SHRINK_MAX_EDGE = 2048
+
+# Cache lifetime (seconds) for content-addressed objects, whose URL changes iff their
+# bytes do. Supabase storage takes seconds and serves "Cache-Control: max-age=<seconds>"
+IMMUTABLE_CACHE_SECONDS = "31536000"
+
+# Already uploaded content: requested storage path -> (sha256 of the original file, public
+# URL). Keyed on the original bytes so a repeat upload is recognised before the costly
+# shrink. The in-process LRU answers repeats without touching disk; the uploads table
+# shares them across workers/restarts. Records expire so a URL can't outlive its object
+# for long, and delete_image_from_supabase evicts them (other processes' LRUs within their TTL)
+UPLOADS_DB = "uploads.db"
+UPLOAD_RECORD_TTL = 7 * 86400
+UPLOADED_URL_CACHE = TTLCache(maxsize=4096, ttl=3600)
+_uploads_local = threading.local()
+
+# Long-lived pool for batch uploads: each worker reads its file while others are
+# mid-upload, so disk reads overlap network time without per-batch thread startup
+UPLOAD_CONCURRENCY = 8
+UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY, thread_name_prefix="supabase-upload")
+
+
+def _uploads_db() -> sqlite3.Connection:
+    """This thread's connection to the uploads table, created on first use."""
+    conn = getattr(_uploads_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(UPLOADS_DB, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Records are only a cache - drop a table from before object_path existed
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(uploads)")]
+        if columns and 'object_path' not in columns:
+            conn.execute("DROP TABLE uploads")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS uploads (
+                hash TEXT NOT NULL,
+                storage_path TEXT NOT NULL,
+                object_path TEXT NOT NULL,
+                url TEXT NOT NULL,
+                uploaded_at REAL NOT NULL,
+                PRIMARY KEY (storage_path, hash)
+            )
+        ''')
+        _uploads_local.conn = conn
+    return conn
+
+
+def _get_uploaded_url(storage_path: str, digest: str) -> Optional[str]:
+    """Public URL of the file with digest already uploaded as storage_path, or None."""
+    cached = UPLOADED_URL_CACHE.get(storage_path)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+    
+    row = _uploads_db().execute(
+        'SELECT url FROM uploads WHERE storage_path = ? AND hash = ? AND uploaded_at >= ?',
+        (storage_path, digest, time.time() - UPLOAD_RECORD_TTL)
+    ).fetchone()
+    if row is None:
+        return None
+    UPLOADED_URL_CACHE.set(storage_path, (digest, row[0]))
+    return row[0]
+
+
+def _record_upload(storage_path: str, digest: str, object_path: str, public_url: str) -> None:
+    """
+    Remember that the file with digest, requested as storage_path, is stored at
+    object_path (which differs when the upload was shrunk and re-encoded).
+    Older records for the path are replaced.
+    """
+    UPLOADED_URL_CACHE.set(storage_path, (digest, public_url))
+    conn = _uploads_db()
+    # One transaction, so concurrent uploads of the same bytes can't interleave
+    # their deletes and inserts into a primary key conflict
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            'DELETE FROM uploads WHERE (storage_path = ? AND hash != ?) OR uploaded_at < ?',
+            (storage_path, digest, time.time() - UPLOAD_RECORD_TTL)
+        )
+        conn.execute(
+            'INSERT OR REPLACE INTO uploads (hash, storage_path, object_path, url, uploaded_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (digest, storage_path, object_path, public_url, time.time())
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _forget_upload(object_path: str) -> None:
+    """Drop the upload records pointing at object_path (after the object is deleted)."""
+    conn = _uploads_db()
+    rows = conn.execute(
+        'SELECT storage_path FROM uploads WHERE storage_path = ? OR object_path = ?',
+        (object_path, object_path)
+    ).fetchall()
+    for requested_path in {object_path, *(row[0] for row in rows)}:
+        UPLOADED_URL_CACHE.delete(requested_path)
+    conn.execute('DELETE FROM uploads WHERE storage_path = ? OR object_path = ?', (object_path, object_path))
+
+
+def _maybe_shrink(
+    data: bytes,
+    max_edge: int = SHRINK_MAX_EDGE,
+    fmt: str = 'WEBP',
+    quality: int = 82
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Downscale and re-encode a large image, keeping its aspect ratio.
+    
+    Args:
+        data (bytes): Original image bytes
+        max_edge (int): Longest edge of the re-encoded image in pixels
+        fmt (str): Pillow format to re-encode to
+        quality (int): Encoder quality
+        
+    Returns:
+        Tuple[bytes, Optional[str]]: The bytes to upload and their file extension, or
+            the original bytes and None when the image is small, animated, can't be
+            decoded, or wouldn't get smaller
+    """
+    if len(data) <= SHRINK_THRESHOLD_BYTES:
+        return data, None
+    
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if getattr(img, 'is_animated', False):
+                return data, None
+            # Bake in the EXIF rotation, since re-encoding drops the metadata
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA' if 'A' in img.getbands() or 'transparency' in img.info else 'RGB')
+            img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            
+            buffer = io.BytesIO()
+            img.save(buffer, fmt, quality=quality, method=6)
+    except Exception as e:
+        print(f"⚠️  Could not shrink image, uploading original: {e}")
+        return data, None
+    
+    shrunk = buffer.getvalue()
+    if len(shrunk) >= len(data):
+        return data, None
+    return shrunk, f".{fmt.lower()}"
+
 
 def upload_image_to_supabase(
     local_image_path: str,
     folder: Optional[str] = None,
-    custom_filename: Optional[str] = None
+    custom_filename: Optional[str] = None,
+    content_addressed: bool = False
 ) -> str:
     """
     Upload an image from local path to Supabase storage and return the public URL.
     
+    Byte-identical re-uploads to the same path are skipped (before any image
+    processing) and return the URL recorded for the first upload. Otherwise
+    images over SHRINK_THRESHOLD_BYTES are downscaled to SHRINK_MAX_EDGE and
+    re-encoded as WebP, and stored under the requested name with a .webp extension.
+    
     Args:
         local_image_path (str): Path to the local image file
         folder (str, optional): Folder path in the bucket (e.g., 'products', 'criteria')
-        custom_filename (str, optional): Custom filename. If not provided, uses original filename with UUID
+        custom_filename (str, optional): Custom filename. If not provided, the file is
+            content-addressed (named by the SHA-256 of its bytes)
+        content_addressed (bool): custom_filename is itself derived from a hash of the
+            image, so the object can be served with a long immutable cache lifetime
         
     Returns:
         str: Public URL of the uploaded image
@@ -55,21 +233,24 @@ def upload_image_to_supabase(
     
     # Get file extension and mime type
     file_extension = image_path.suffix.lower()
-    mime_type, _ = mimetypes.guess_type(local_image_path)
+    mime_type = IMAGE_MIME_TYPES.get(file_extension)
     
-    if not mime_type or not mime_type.startswith('image/'):
+    if not mime_type:
         raise ValueError(f"File is not a valid image: {local_image_path}")
     
+    # Read image file
+    with open(local_image_path, 'rb') as f:
+        image_data = f.read()
+    digest = hashlib.sha256(image_data).hexdigest()
+    
     # Generate filename
     if custom_filename:
         filename = custom_filename
         if not filename.endswith(file_extension):
             filename += file_extension
     else:
-        # Create unique filename: original-name_uuid.ext
-        unique_id = str(uuid.uuid4())[:8]
-        original_name = image_path.stem
-        filename = f"{original_name}_{unique_id}{file_extension}"
+        # Content-addressed: the same bytes always map to the same object
+        filename = f"{digest[:32]}{file_extension}"
     
     # Build storage path
     if folder:
@@ -77,31 +258,77 @@ def upload_image_to_supabase(
     else:
         storage_path = filename
     
-    # Read image file
-    with open(local_image_path, 'rb') as f:
-        image_data = f.read()
+    # Skip the upload entirely (and the shrink) if this file was already uploaded here
+    public_url = _get_uploaded_url(storage_path, digest)
+    if public_url is not None:
+        return public_url
+    
+    # Large images are uploaded downscaled, under the re-encoded format
+    object_path = storage_path
+    image_data, shrunk_extension = _maybe_shrink(image_data)
+    if shrunk_extension:
+        object_path = storage_path[:-len(file_extension)] + shrunk_extension
+        mime_type = IMAGE_MIME_TYPES[shrunk_extension]
+    
+    file_options = {"content-type": mime_type}
+    if content_addressed or not custom_filename:
+        # The name is the hash of the bytes, so the URL's content never changes -
+        # let browsers and CDNs keep it for a year without revalidating
+        file_options["cache-control"] = IMMUTABLE_CACHE_SECONDS
+        file_options["upsert"] = "false"
     
     # Upload to Supabase
     try:
         response = supabase.storage.from_(SUPABASE_BUCKET).upload(
-            path=storage_path,
+            path=object_path,
             file=image_data,
-            file_options={"content-type": mime_type}
+            file_options=file_options
         )
         
         # Get public URL
-        public_url = supabase.storage.from_(SUPABASE_BUCKET).get_public_url(storage_path)
-        
-        return public_url
+        public_url = supabase.storage.from_(SUPABASE_BUCKET).get_public_url(object_path)
         
     except Exception as e:
         # If file already exists, you might want to either overwrite or return existing URL
         if "already exists" in str(e).lower():
             # Return the public URL of the existing file
-            public_url = supabase.storage.from_(SUPABASE_BUCKET).get_public_url(storage_path)
-            return public_url
+            public_url = supabase.storage.from_(SUPABASE_BUCKET).get_public_url(object_path)
         else:
             raise Exception(f"Failed to upload image to Supabase: {str(e)}")
+    
+    _record_upload(storage_path, digest, object_path, public_url)
+    return public_url
+
+
+def upload_images_batch(
+    local_image_paths: List[str],
+    folder: Optional[str] = None
+) -> List[Optional[str]]:
+    """
+    Upload several images concurrently over the shared Supabase client.
+    
+    The client keeps its connections alive, so the uploads reuse a small pool
+    of connections instead of handshaking once per file. At most
+    UPLOAD_CONCURRENCY uploads (and file reads) are in flight at once.
+    
+    Args:
+        local_image_paths (List[str]): Paths to the local image files
+        folder (str, optional): Folder path in the bucket for all images
+        
+    Returns:
+        List[Optional[str]]: Public URL per input path, in order (None where the upload failed)
+        
+    Example:
+        >>> urls = upload_images_batch(['a.jpg', 'b.jpg'], folder='criteria')
+    """
+    def upload_one(local_image_path: str) -> Optional[str]:
+        try:
+            return upload_image_to_supabase(local_image_path, folder=folder)
+        except Exception as e:
+            print(f"✗ Upload failed for {local_image_path}: {e}")
+            return None
+    
+    return list(UPLOAD_EXECUTOR.map(upload_one, local_image_paths))
 
 
 def delete_image_from_supabase(storage_path: str) -> bool:
@@ -119,6 +346,8 @@ def delete_image_from_supabase(storage_path: str) -> bool:
     """
     try:
         supabase.storage.from_(SUPABASE_BUCKET).remove([storage_path])
+        # A re-upload of the same bytes must upload again, not return the dead URL
+        _forget_upload(storage_path)
         return True
     except Exception as e:
         raise Exception(f"Failed to delete image from Supabase: {str(e)}")
@@ -145,10 +374,3 @@ if __name__ == "__main__":
             
     except Exception as e:
         print(f"✗ Upload failed: {e}")
-
-if __name__ == "__main__":
-    test_image = "test_materials/dog.png"
-    url = upload_image_to_supabase(
-        local_image_path="./test_materials/dog.png",
-    )
-    print(f"Public URL: {url}")
\ No newline at end of file